@@ -1,28 +1,52 @@
 import os
+import logging
 import jwt
-from passlib.hash import bcrypt
 from fastapi import HTTPException, status, Depends, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import update
 from datetime import datetime, timedelta
 
-from app.db.connection import get_session
+from app.db.connection import get_session, get_async_session, engine
 from app.models.finance_models import User
+from app.core.user_cache import get_user_cache
+from app.core.hashing import (
+    hash_password, verify_password, hash_password_async, verify_password_async, password_needs_rehash
+)
 
 JWT_SECRET = os.getenv("JWT_SECRET", "SUPERSECRET")
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+logger = logging.getLogger(__name__)
+
 # Определяем схему безопасности
 bearer_scheme = HTTPBearer()
 
 
-# хэширование
-def hash_password(password: str) -> str:
-    return bcrypt.using(rounds=12).hash(password)
+# хэширование вынесено в пул процессов: app/core/hashing.py
+
+def rehash_password(user_id: int, plain_password: str, old_hash: str) -> None:
+    """
+    Фоновая задача после успешного логина: пересчитываем устаревший хэш
+    по текущей политике. Обновляем только если хэш не успел смениться
+    (например, через change-password), чтобы не затереть новый пароль.
+    """
+    try:
+        new_hash = hash_password(plain_password)
+    except HTTPException:
+        # Пул перегружен — попробуем при следующем логине
+        logger.info("Skipping rehash for user %s: hashing pool is saturated", user_id)
+        return
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.verify(plain_password, hashed_password)
+    with Session(engine) as session:
+        session.execute(
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        session.commit()
 
 # JWT
 def create_access_token(user_id: int) -> str:
@@ -59,15 +83,42 @@ def get_current_user(
     1) HTTPBearer сам найдёт заголовок "Authorization: Bearer <token>"
     2) credentials.credentials = "<token>"
     3) Декодируем токен и получаем user_id
-    4) Ищем пользователя в БД
+    4) Берём пользователя из кэша, а при промахе ищем в БД
+
+    Из кэша возвращается отсоединённый User без hashed_password,
+    поэтому для изменения пользователя его нужно заново загрузить из сессии.
     """
     token = credentials.credentials
     user_id = decode_access_token(token)
 
-    user = session.get(User, user_id)
+    cache = get_user_cache()
+    cached = cache.get(user_id)
+    if cached is not None:
+        return User(**cached)
+
+    return _remember_user(cache, user_id, session.get(User, user_id))
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Security(bearer_scheme),
+    session: AsyncSession = Depends(get_async_session)
+) -> User:
+    """То же, что get_current_user, для PR1_DB_MODE=async: промах кэша читается через AsyncSession."""
+    user_id = decode_access_token(credentials.credentials)
+
+    cache = get_user_cache()
+    cached = cache.get(user_id)
+    if cached is not None:
+        return User(**cached)
+
+    return _remember_user(cache, user_id, await session.get(User, user_id))
+
+
+def _remember_user(cache, user_id: int, user) -> User:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
+    cache.set(user_id, {"id": user.id, "username": user.username, "email": user.email})
     return user
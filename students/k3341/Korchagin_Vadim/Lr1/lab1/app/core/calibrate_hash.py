@@ -0,0 +1,61 @@
+"""
+Калибровка стоимости хэширования паролей на текущем железе.
+
+Замеряет время одного хэша для разных bcrypt rounds (и argon2 time_cost,
+если установлен argon2-cffi) и подсказывает максимальную стоимость,
+которая укладывается в бюджет латентности логина.
+
+    python -m app.core.calibrate_hash --budget-ms 250
+    python -m app.core.calibrate_hash --scheme argon2 --budget-ms 150
+"""
+import argparse
+import statistics
+import time
+
+from app.core.hashing import build_password_context
+
+BCRYPT_ROUNDS_RANGE = range(8, 16)
+ARGON2_TIME_COST_RANGE = range(1, 11)
+
+
+def measure_ms(context, samples: int) -> float:
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="допустимое время одного хэша")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    best = None
+    if args.scheme == "bcrypt":
+        for rounds in BCRYPT_ROUNDS_RANGE:
+            elapsed = measure_ms(build_password_context(["bcrypt"], bcrypt_rounds=rounds), args.samples)
+            print(f"bcrypt rounds={rounds:<3} {elapsed:8.1f} ms")
+            if elapsed > args.budget_ms:
+                break
+            best = f"PR1_HASH_SCHEMES=bcrypt PR1_BCRYPT_ROUNDS={rounds}"
+    else:
+        for time_cost in ARGON2_TIME_COST_RANGE:
+            context = build_password_context(["argon2", "bcrypt"], argon2_time_cost=time_cost)
+            elapsed = measure_ms(context, args.samples)
+            print(f"argon2 time_cost={time_cost:<3} {elapsed:8.1f} ms")
+            if elapsed > args.budget_ms:
+                break
+            best = f"PR1_HASH_SCHEMES=argon2,bcrypt PR1_ARGON2_TIME_COST={time_cost}"
+
+    if best is None:
+        print(f"Даже минимальная стоимость не укладывается в {args.budget_ms} ms")
+    else:
+        print(f"Рекомендуется: {best}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_echo(name: str):
+    # SQLAlchemy принимает echo=False / True / "debug"
+    value = os.getenv(name, "false").strip().lower()
+    if value == "debug":
+        return "debug"
+    return value in ("1", "true", "yes", "on", "info")
+
+
+# База данных
+DB_URL = os.getenv("PR1_DB_URL")
+DB_ASYNC_URL = os.getenv("PR1_ASYNC_DB_URL")
+DB_MODE = os.getenv("PR1_DB_MODE", "sync")
+
+# Реплики для чтения через запятую; пусто — все запросы идут в основную базу
+DB_REPLICA_URLS = [u.strip() for u in os.getenv("PR1_DB_REPLICA_URLS", "").split(",") if u.strip()]
+# Сколько секунд после записи клиент читает с основной базы (read-your-writes поверх лага реплик)
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("PR1_DB_REPLICA_STICKY_SECONDS", "5"))
+
+# Пул соединений (для SQLite размер пула не задаётся)
+DB_POOL_SIZE = int(os.getenv("PR1_DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("PR1_DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("PR1_DB_POOL_TIMEOUT", "30"))
+DB_POOL_PRE_PING = env_bool("PR1_DB_POOL_PRE_PING", True)
+DB_POOL_RECYCLE = int(os.getenv("PR1_DB_POOL_RECYCLE", "1800"))
+
+# Таймаут одного запроса в Postgres, мс (0 — без ограничения)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("PR1_DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# Логирование SQL: false (по умолчанию), true или debug
+DB_ECHO = env_echo("PR1_DB_ECHO")
+
+# Кэш пользователей в get_current_user: memory или redis
+USER_CACHE_BACKEND = os.getenv("PR1_USER_CACHE_BACKEND", "memory")
+USER_CACHE_TTL_SECONDS = int(os.getenv("PR1_USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("PR1_USER_CACHE_MAX_SIZE", "10000"))
+REDIS_URL = os.getenv("PR1_REDIS_URL", "redis://localhost:6379/0")
+
+# Пул процессов для bcrypt: 0 воркеров — хэшировать прямо в потоке запроса
+HASH_WORKERS = int(os.getenv("PR1_HASH_WORKERS", str(min(os.cpu_count() or 1, 4))))
+# Сколько операций хэширования может ждать в очереди сверх занятых воркеров
+HASH_QUEUE_LIMIT = int(os.getenv("PR1_HASH_QUEUE_LIMIT", "32"))
+# Какая доля threadpool anyio (40 потоков по умолчанию) может ждать хэширования:
+# каждая операция держит поток запроса, пока bcrypt считается в процессе
+HASH_THREADPOOL_SHARE = float(os.getenv("PR1_HASH_THREADPOOL_SHARE", "0.25"))
+
+# Политика хэширования паролей: первая схема — основная, остальные считаются устаревшими
+HASH_SCHEMES = [s.strip() for s in os.getenv("PR1_HASH_SCHEMES", "bcrypt").split(",") if s.strip()]
+BCRYPT_ROUNDS = int(os.getenv("PR1_BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST = int(os.getenv("PR1_ARGON2_TIME_COST", "3"))
+
+# HTTP-кэш справочников: сколько секунд ответ живёт в памяти процесса
+HTTP_CACHE_TTL_SECONDS = int(os.getenv("PR1_HTTP_CACHE_TTL_SECONDS", "30"))
+
+# Отчёты: брать прошлые месяцы из снапшота (его обновляет python -m app.db.reports)
+REPORT_SNAPSHOTS_ENABLED = env_bool("PR1_REPORT_SNAPSHOTS", False)
+
+# Уведомления о превышении бюджета: log, webhook или memory (для тестов)
+NOTIFY_SINK = os.getenv("PR1_NOTIFY_SINK", "log")
+NOTIFY_WEBHOOK_URL = os.getenv("PR1_NOTIFY_WEBHOOK_URL")
+# Окно, за которое события по одной паре (user, category) схлопываются в одну проверку
+NOTIFY_COALESCE_SECONDS = float(os.getenv("PR1_NOTIFY_COALESCE_SECONDS", "0.5"))
+
+# Бюджет запросов к БД на эндпоинт: off, warn (в лог) или strict (ошибка — для тестов)
+QUERY_BUDGET_MODE = os.getenv("PR1_QUERY_BUDGET_MODE", "warn")
+# Бюджет для эндпоинтов без @query_budget; 0 — не проверять
+QUERY_BUDGET_DEFAULT = int(os.getenv("PR1_QUERY_BUDGET_DEFAULT", "0"))
+
+# Метрики Prometheus на /metrics; false — не вешать middleware (для сравнения накладных расходов)
+METRICS_ENABLED = env_bool("PR1_METRICS_ENABLED", True)
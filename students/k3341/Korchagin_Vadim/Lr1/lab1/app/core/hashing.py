@@ -0,0 +1,156 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import anyio.to_thread
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core import config
+from app.core.metrics import hash_queue_seconds, hash_rejected_total
+
+
+def build_password_context(schemes=None, bcrypt_rounds=None, argon2_time_cost=None) -> CryptContext:
+    """
+    Политика хэширования. Хэши других схем или с другой стоимостью
+    считаются устаревшими (needs_update) и перехэшируются при логине.
+    """
+    schemes = schemes or config.HASH_SCHEMES
+    options = {"bcrypt__rounds": bcrypt_rounds or config.BCRYPT_ROUNDS}
+    if "argon2" in schemes:
+        options["argon2__time_cost"] = argon2_time_cost or config.ARGON2_TIME_COST
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+
+# Воркеры запускаются через forkserver (см. HashingPool.start), поэтому импортируют
+# модуль заново и собирают тот же контекст из окружения
+password_context = build_password_context()
+
+
+# Функции ниже выполняются в дочерних процессах, поэтому они на уровне модуля
+def _hash(password: str) -> str:
+    return password_context.hash(password)
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return password_context.verify(plain_password, hashed_password)
+
+def _timed(fn, *args):
+    # Время старта в воркере: разница с моментом отправки — ожидание в очереди пула
+    return time.time(), fn(*args)
+
+
+class HashingPool:
+    """
+    Ограниченный пул процессов для bcrypt.
+    Одновременно принимается не больше workers + queue_limit операций,
+    остальные сразу получают 429, чтобы всплеск логинов не копил очередь.
+    Ожидающая операция держит поток threadpool, поэтому при старте приложения
+    предел ещё урезается до доли threadpool (limit_to_threadpool).
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.capacity = workers + queue_limit
+        self._in_flight = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def limit_to_threadpool(self, total_tokens: int) -> None:
+        """Оставляет sync-эндпоинтам хотя бы (1 - HASH_THREADPOOL_SHARE) потоков threadpool."""
+        share = max(int(total_tokens * config.HASH_THREADPOOL_SHARE), 1)
+        self.capacity = min(self.capacity, max(share, self.workers))
+
+    def start(self) -> None:
+        """
+        Поднимает процессы; вызывается в startup приложения, скрипты и alembic пул не трогают.
+        fork из многопоточного процесса (threadpool, драйверы БД) может унаследовать
+        захваченные блокировки и зависнуть, поэтому воркеры стартуют через forkserver.
+        """
+        if self.workers:
+            self._get_executor()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Если start не вызывали (скрипт без startup), пул создаётся при первой операции
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver")
+                )
+            return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                hash_rejected_total.inc()
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many password operations in progress, try again later",
+                    headers={"Retry-After": "1"}
+                )
+            self._in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+
+        self._acquire()
+        try:
+            submitted = time.time()
+            started, result = self._get_executor().submit(_timed, fn, *args).result()
+            hash_queue_seconds.observe(max(started - submitted, 0.0))
+            return result
+        finally:
+            self._release()
+
+    async def run_async(self, fn, *args):
+        """
+        Как run, но для async-эндпоинтов: результат ждём в event loop,
+        поток threadpool не занимается. Без воркеров считаем в threadpool.
+        """
+        if not self.workers:
+            return await anyio.to_thread.run_sync(fn, *args)
+
+        self._acquire()
+        try:
+            submitted = time.time()
+            future = self._get_executor().submit(_timed, fn, *args)
+            started, result = await asyncio.wrap_future(future)
+            hash_queue_seconds.observe(max(started - submitted, 0.0))
+            return result
+        finally:
+            self._release()
+
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+hashing_pool = HashingPool(config.HASH_WORKERS, config.HASH_QUEUE_LIMIT)
+
+
+def hash_password(password: str) -> str:
+    return hashing_pool.run(_hash, password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return hashing_pool.run(_verify, plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run_async(_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run_async(_verify, plain_password, hashed_password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    # Только разбор строки хэша, CPU почти не тратит — можно звать в потоке запроса
+    return password_context.needs_update(hashed_password)
@@ -0,0 +1,79 @@
+import hashlib
+import threading
+import time
+from typing import Callable
+
+import orjson
+from fastapi import Request, Response
+
+from app.core import config
+
+
+class TableVersions:
+    """
+    Счётчик версий для каждой таблицы-справочника. POST/PATCH/DELETE вызывают bump,
+    и закэшированное тело с прежней версией сразу становится недействительным.
+    Версии живут в памяти процесса: запись через другой воркер сюда не доходит,
+    поэтому кэш процесса дополнительно ограничен HTTP_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+
+    def get(self, table: str) -> int:
+        with self._lock:
+            return self._versions.get(table, 0)
+
+    def bump(self, table: str) -> None:
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+
+table_versions = TableVersions()
+# table -> (version, expires_at, etag, body)
+_response_cache = {}
+_cache_lock = threading.Lock()
+
+
+def bump_table_version(table: str) -> None:
+    table_versions.bump(table)
+
+
+def _etag_for(body: bytes) -> str:
+    # ETag считается по содержимому, поэтому одинаков во всех воркерах
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+
+def cached_list_response(request: Request, table: str, load: Callable[[], list]) -> Response:
+    """
+    Ответ для справочника с ETag по содержимому:
+    - тело берётся из кэша процесса, пока не было bump и не истёк TTL, иначе вызываем load();
+    - совпал If-None-Match с ETag этого тела — 304 без тела.
+    Так 304 не переживает TTL: после него ETag сверяется со свежими данными из БД.
+    If-Modified-Since не поддерживается — время изменения в памяти процесса
+    не согласовано между воркерами.
+    """
+    version = table_versions.get(table)
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _response_cache.get(table)
+    if entry is not None and entry[0] == version and entry[1] > now:
+        etag, body = entry[2], entry[3]
+    else:
+        body = orjson.dumps(load())
+        etag = _etag_for(body)
+        with _cache_lock:
+            _response_cache[table] = (version, now + config.HTTP_CACHE_TTL_SECONDS, etag, body)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,17 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+# Деньги храним в минорных единицах (копейки, центы) целым числом.
+# Для всех поддерживаемых валют считаем, что в основной единице 100 минорных.
+MINOR_UNITS_EXPONENT = 2
+DEFAULT_CURRENCY = "RUB"
+
+
+def to_minor(amount: Decimal) -> int:
+    # Decimal("12.345") -> 1235, округление как в бухгалтерии (половина вверх)
+    quantized = Decimal(amount).quantize(Decimal(1).scaleb(-MINOR_UNITS_EXPONENT), rounding=ROUND_HALF_UP)
+    return int(quantized.scaleb(MINOR_UNITS_EXPONENT))
+
+
+def from_minor(amount: int) -> Decimal:
+    # 1235 -> Decimal("12.35")
+    return Decimal(int(amount)).scaleb(-MINOR_UNITS_EXPONENT)
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import httpx
+from sqlmodel import Session, select
+
+from app.core import config
+from app.core.money import from_minor
+from app.db.connection import engine
+from app.db.spending import spent_in_period
+from app.models.finance_models import Budget, UserCategoryPreference
+
+logger = logging.getLogger(__name__)
+
+
+class LogSink:
+    async def send(self, notification: dict) -> None:
+        logger.warning("Budget overrun: %s", notification)
+
+
+class WebhookSink:
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    async def send(self, notification: dict) -> None:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            await client.post(self.url, json=notification)
+
+
+class InMemorySink:
+    def __init__(self):
+        self.notifications: List[dict] = []
+
+    async def send(self, notification: dict) -> None:
+        self.notifications.append(notification)
+
+
+def create_sink():
+    if config.NOTIFY_SINK == "webhook":
+        if config.NOTIFY_WEBHOOK_URL:
+            return WebhookSink(config.NOTIFY_WEBHOOK_URL)
+        logger.warning("PR1_NOTIFY_SINK=webhook without PR1_NOTIFY_WEBHOOK_URL, notifications go to the log")
+    if config.NOTIFY_SINK == "memory":
+        return InMemorySink()
+    return LogSink()
+
+
+def find_overruns(engine, user_id: int, category_id: int, notified: Dict[date, Set[int]]) -> List[dict]:
+    """
+    Синхронная проверка бюджетов пары (user, category) за текущий месяц.
+    Вызывается из воркера в отдельном потоке.
+    notified — {period: {budget_id}}, о каких превышениях уже сообщили;
+    прошлые месяцы из него выбрасываются, а бюджет, траты по которому
+    вернулись в лимит, удаляется — следующее превышение снова даст уведомление.
+    """
+    period = datetime.utcnow().date().replace(day=1)
+    for old_period in [p for p in notified if p < period]:
+        del notified[old_period]
+    notified_budgets = notified.setdefault(period, set())
+    with Session(engine) as session:
+        pref = session.get(UserCategoryPreference, (user_id, category_id))
+        if pref is not None and not pref.notification_enabled:
+            return []
+
+        budgets = session.exec(
+            select(Budget).where(Budget.user_id == user_id, Budget.category_id == category_id)
+        ).all()
+        if not budgets:
+            return []
+
+        # Траты сравниваем с лимитом только в валюте бюджета
+        spent_by_currency = {
+            currency: spent_in_period(session, user_id, category_id, period, currency)[0]
+            for currency in {budget.currency for budget in budgets}
+        }
+
+    result = []
+    for budget in budgets:
+        spent = spent_by_currency[budget.currency]
+        if spent <= budget.limit_amount:
+            notified_budgets.discard(budget.id)
+            continue
+        if budget.id in notified_budgets:
+            continue
+        notified_budgets.add(budget.id)
+        result.append({
+            "budget_id": budget.id,
+            "user_id": user_id,
+            "category_id": category_id,
+            "period": period.isoformat(),
+            "limit_amount": str(from_minor(budget.limit_amount)),
+            "currency": budget.currency,
+            "spent": str(from_minor(spent)),
+        })
+    return result
+
+
+class BudgetEventWorker:
+    """
+    asyncio-воркер событий «создана транзакция».
+    publish() только кладёт пару (user, category) в множество ожидающих,
+    поэтому всплеск из 1000 транзакций по одной паре даёт одну проверку.
+    """
+
+    def __init__(self, engine, sink, coalesce_seconds: float):
+        self.engine = engine
+        self.sink = sink
+        self.coalesce_seconds = coalesce_seconds
+        self._pending: Set[Tuple[int, int]] = set()
+        # {period: {budget_id}}, о которых уже сообщили, чтобы не слать повторно (см. find_overruns)
+        self._notified: Dict[date, Set[int]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def publish(self, user_id: int, category_id: int) -> None:
+        # Может вызываться из потоков threadpool, поэтому передаём в цикл событий
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._enqueue, user_id, category_id)
+
+    def _enqueue(self, user_id: int, category_id: int) -> None:
+        self._pending.add((user_id, category_id))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.coalesce_seconds)
+            self._wakeup.clear()
+            batch, self._pending = self._pending, set()
+            for user_id, category_id in batch:
+                try:
+                    await self.evaluate(user_id, category_id)
+                except Exception:
+                    logger.exception("Budget check failed for user %s category %s", user_id, category_id)
+
+    async def evaluate(self, user_id: int, category_id: int) -> None:
+        overruns = await asyncio.to_thread(find_overruns, self.engine, user_id, category_id, self._notified)
+        for notification in overruns:
+            await self.sink.send(notification)
+
+
+# Запускается в startup приложения; до этого publish ничего не делает
+budget_events = BudgetEventWorker(engine, create_sink(), config.NOTIFY_COALESCE_SECONDS)
+
+
+def publish_transaction_event(user_id: int, category_id: int) -> None:
+    budget_events.publish(user_id, category_id)
@@ -0,0 +1,93 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core import config
+
+
+class InMemoryUserCache:
+    """
+    LRU-кэш внутри процесса: не больше max_size записей, каждая живёт ttl секунд.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[dict]:
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[user_id]
+                return None
+            self._data.move_to_end(user_id)
+            return value
+
+    def set(self, user_id: int, value: dict) -> None:
+        with self._lock:
+            self._data[user_id] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(user_id)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, user_id: int) -> None:
+        with self._lock:
+            self._data.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisUserCache:
+    """
+    Кэш в Redis-совместимом хранилище. Подойдёт любой клиент с get/setex/delete
+    (redis.Redis, fakeredis.FakeRedis). Вытеснением занимается сам Redis по TTL.
+    """
+
+    def __init__(self, client, ttl: int, prefix: str = "user:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, user_id: int) -> Optional[dict]:
+        raw = self.client.get(f"{self.prefix}{user_id}")
+        return json.loads(raw) if raw else None
+
+    def set(self, user_id: int, value: dict) -> None:
+        self.client.setex(f"{self.prefix}{user_id}", self.ttl, json.dumps(value))
+
+    def delete(self, user_id: int) -> None:
+        self.client.delete(f"{self.prefix}{user_id}")
+
+
+def create_user_cache():
+    if config.USER_CACHE_BACKEND == "redis":
+        import redis
+        client = redis.Redis.from_url(config.REDIS_URL)
+        return RedisUserCache(client, config.USER_CACHE_TTL_SECONDS)
+    return InMemoryUserCache(config.USER_CACHE_TTL_SECONDS, config.USER_CACHE_MAX_SIZE)
+
+
+_user_cache = create_user_cache()
+
+
+def get_user_cache():
+    return _user_cache
+
+
+def set_user_cache(backend) -> None:
+    # Подмена бэкенда, например на RedisUserCache(fakeredis.FakeRedis(), ...)
+    global _user_cache
+    _user_cache = backend
+
+
+def invalidate_user(user_id: int) -> None:
+    _user_cache.delete(user_id)
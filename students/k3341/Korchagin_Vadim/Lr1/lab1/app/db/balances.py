@@ -0,0 +1,49 @@
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlmodel import Session
+
+from app.models.finance_models import Account, Transaction
+
+
+def adjust_balance(session: Session, account_id: int, delta: int, currency: Optional[str] = None) -> bool:
+    """
+    Атомарно меняет баланс (в минорных единицах) на стороне БД: UPDATE account SET balance = balance + :delta.
+    Параллельные транзакции по одному счёту не теряют обновления, потому что
+    строка блокируется самим UPDATE до коммита. С currency условие на валюту счёта
+    стоит в том же WHERE. Возвращает False, если счёта нет или валюта другая.
+    """
+    stmt = update(Account).where(Account.id == account_id)
+    if currency is not None:
+        stmt = stmt.where(Account.currency == currency)
+    result = session.execute(
+        stmt
+        .values(balance=Account.balance + delta)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+
+def transactions_total(account_id):
+    """Коррелированный подзапрос: сумма транзакций счёта (0, если их нет)."""
+    return (
+        select(func.coalesce(func.sum(Transaction.amount), 0))
+        .where(Transaction.account_id == account_id)
+        .scalar_subquery()
+    )
+
+
+def set_balance(session: Session, account_id: int, balance: int) -> bool:
+    """
+    Ручная установка баланса. Начальный баланс пересчитывается так, чтобы
+    balance = opening_balance + сумма транзакций — иначе сверка откатит правку.
+    Поэтому PATCH /accounts переносит в opening_balance и любое текущее расхождение:
+    после него сверка этот счёт уже не покажет.
+    """
+    result = session.execute(
+        update(Account)
+        .where(Account.id == account_id)
+        .values(balance=balance, opening_balance=balance - transactions_total(Account.id))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
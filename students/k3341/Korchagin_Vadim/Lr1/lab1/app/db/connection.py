@@ -1,15 +1,119 @@
-import os
+from fastapi import Request
 from sqlmodel import SQLModel, create_engine, Session
-from dotenv import load_dotenv
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
 
-load_dotenv()
+from app.core import config
+from app.db.pool_metrics import TimedQueuePool
+from app.db.replicas import RoundRobin, reads_from_primary
+from app.db.search import install_search
+
+db_url = config.DB_URL
+
+# Режим работы роутеров: "sync" (threadpool Starlette) или "async" (AsyncSession)
+db_mode = config.DB_MODE
+
+
+def to_async_url(url: str) -> str:
+    """
+    Подбираем асинхронный драйвер для того же URL:
+    postgresql(+psycopg2) -> postgresql+asyncpg, sqlite -> sqlite+aiosqlite.
+    """
+    scheme, rest = url.split("://", 1)
+    if scheme.startswith("postgresql"):
+        return f"postgresql+asyncpg://{rest}"
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    Общие параметры движка из config: echo, размеры пула и statement_timeout.
+    """
+    options = {
+        "echo": config.DB_ECHO,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+    }
+    connect_args = {}
+
+    if url.startswith("sqlite"):
+        # SQLite-соединение из пула может перейти в другой поток threadpool
+        if not is_async:
+            connect_args["check_same_thread"] = False
+    else:
+        options.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+        )
+        if not is_async:
+            options["poolclass"] = TimedQueuePool
+
+        if config.DB_STATEMENT_TIMEOUT_MS:
+            if is_async:
+                connect_args["server_settings"] = {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}
+            else:
+                connect_args["options"] = f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+engine = create_engine(db_url, **engine_options(db_url))
+
+async_db_url = config.DB_ASYNC_URL or to_async_url(db_url)
+async_engine = (
+    create_async_engine(async_db_url, **engine_options(async_db_url, is_async=True))
+    if db_mode == 'async' else None
+)
+
+# Реплики только читаются: схему и данные на них приносит репликация, init_db их не трогает
+replica_engines = [create_engine(url, **engine_options(url)) for url in config.DB_REPLICA_URLS]
+async_replica_engines = [
+    create_async_engine(to_async_url(url), **engine_options(to_async_url(url), is_async=True))
+    for url in config.DB_REPLICA_URLS
+] if db_mode == 'async' else []
+replica_round_robin = RoundRobin(len(config.DB_REPLICA_URLS))
+
+
+def read_engine(request: Request, primary, replicas: list):
+    """
+    Движок для чтения: очередная реплика по кругу, а для клиента,
+    который только что писал, — основная база. Выбор виден в request.state.db_target.
+    """
+    if not replicas:
+        return primary
+    if reads_from_primary(request):
+        request.state.db_target = "primary"
+        return primary
+    index = replica_round_robin.next()
+    request.state.db_target = f"replica-{index}"
+    return replicas[index]
 
-db_url = os.getenv('PR1_DB_URL')
-engine = create_engine(db_url, echo=True)
 
 def init_db() -> None:
     SQLModel.metadata.create_all(engine)
+    # Полнотекстовый индекс живёт вне метаданных моделей (tsvector / FTS5)
+    with engine.begin() as connection:
+        install_search(connection)
 
 def get_session():
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+def get_read_session(request: Request):
+    """Сессия для эндпоинтов, которые ничего не пишут: может смотреть на реплику."""
+    with Session(read_engine(request, engine, replica_engines)) as session:
+        yield session
+
+async def get_async_read_session(request: Request):
+    bind = read_engine(request, async_engine, async_replica_engines)
+    async with AsyncSession(bind, expire_on_commit=False) as session:
+        yield session
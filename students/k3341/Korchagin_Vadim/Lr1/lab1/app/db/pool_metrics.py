@@ -0,0 +1,58 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool, который считает выдачи соединений и время их ожидания
+    (очередь пула + при необходимости открытие нового соединения и pre-ping).
+    В timeouts попадают только таймауты очереди пула; ошибки подключения
+    (сеть, авторизация) не считаются ни таймаутами, ни выдачами.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return connection
+
+
+def pool_stats(pool) -> dict:
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, TimedQueuePool):
+        with pool._stats_lock:
+            checkouts = pool.checkouts
+            stats.update(
+                checkouts=checkouts,
+                timeouts=pool.timeouts,
+                wait_ms_total=round(pool.wait_seconds_total * 1000, 3),
+                wait_ms_avg=round(pool.wait_seconds_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                wait_ms_max=round(pool.wait_seconds_max * 1000, 3),
+            )
+    return stats
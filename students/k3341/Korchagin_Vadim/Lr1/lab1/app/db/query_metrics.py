@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+
+from app.core import config
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class QueryStats:
+    """
+    Счётчик запросов к БД в рамках одного HTTP-запроса. Объект кладётся в contextvar
+    в middleware и меняется на месте, поэтому его видят и потоки threadpool, и async-код.
+    """
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Время старта живёт в контексте выполнения: упавший запрос after не вызывает,
+    # и его отметка уходит вместе с контекстом, а не копится в соединении
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.count += 1
+    started = getattr(context, "_query_started", None)
+    if started is not None:
+        stats.seconds += time.perf_counter() - started
+
+
+def install_query_hooks(engine) -> None:
+    """Вешает счётчик на движок; для AsyncEngine передавать async_engine.sync_engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def query_budget(max_queries: int):
+    """
+    Объявляет, сколько запросов к БД может сделать эндпоинт.
+    Превышение пишется в лог, а при PR1_QUERY_BUDGET_MODE=strict роняет запрос.
+    """
+    def decorator(func):
+        func.query_budget = max_queries
+        return func
+    return decorator
+
+
+class RouteQueryMetrics:
+    """Накопленная статистика запросов к БД по шаблонам маршрутов."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route: str, stats: QueryStats, budget: Optional[int], exceeded: bool) -> None:
+        with self._lock:
+            item = self._routes.setdefault(route, {
+                "requests": 0, "queries_total": 0, "queries_max": 0,
+                "db_seconds_total": 0.0, "budget": budget, "budget_exceeded": 0,
+            })
+            item["requests"] += 1
+            item["queries_total"] += stats.count
+            item["queries_max"] = max(item["queries_max"], stats.count)
+            item["db_seconds_total"] += stats.seconds
+            item["budget_exceeded"] += int(exceeded)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                route: {
+                    "requests": item["requests"],
+                    "queries_avg": round(item["queries_total"] / item["requests"], 2),
+                    "queries_max": item["queries_max"],
+                    "db_ms_avg": round(item["db_seconds_total"] * 1000 / item["requests"], 3),
+                    "budget": item["budget"],
+                    "budget_exceeded": item["budget_exceeded"],
+                }
+                for route, item in sorted(self._routes.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+route_query_metrics = RouteQueryMetrics()
+
+
+async def query_metrics_middleware(request: Request, call_next):
+    stats = QueryStats()
+    token = _current.set(stats)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+    total = time.perf_counter() - started
+
+    # Роутер уже записал в scope найденный маршрут и эндпоинт
+    route = request.scope.get("route")
+    if route is None:
+        return response
+    endpoint = request.scope.get("endpoint")
+    budget = getattr(endpoint, "query_budget", None)
+    if budget is None and config.QUERY_BUDGET_DEFAULT > 0:
+        budget = config.QUERY_BUDGET_DEFAULT
+    exceeded = budget is not None and stats.count > budget
+
+    route_key = f"{request.method} {route.path}"
+    route_query_metrics.record(route_key, stats, budget, exceeded)
+
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries", '
+        f"app;dur={total * 1000:.2f}"
+    )
+    if exceeded:
+        message = f"{route_key}: {stats.count} DB queries, budget {budget}"
+        if config.QUERY_BUDGET_MODE == "strict":
+            raise QueryBudgetExceeded(message)
+        if config.QUERY_BUDGET_MODE == "warn":
+            logger.warning("Query budget exceeded: %s", message)
+    return response
@@ -0,0 +1,161 @@
+"""
+Сверка денормализованного Account.balance с транзакциями.
+
+Ожидаемый баланс = opening_balance + сумма транзакций счёта. Счета обходятся
+диапазонами id по --chunk-size штук; каждый диапазон — одна короткая транзакция
+с одним set-based запросом, так что на живой базе строки не держатся долго.
+
+До миграции e83b1d9f4a62 колонки opening_balance нет: тогда ожидаемый баланс —
+просто сумма транзакций, и доступен только отчёт (--fix обнулил бы начальные остатки).
+Его стоит посмотреть до миграции: она считает всю текущую разницу начальным остатком.
+
+    python -m app.db.reconcile               # только отчёт
+    python -m app.db.reconcile --fix --chunk-size 500 --pause 0.05
+"""
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, inspect, select, update
+from sqlmodel import Session
+
+from app.db.balances import transactions_total
+from app.models.finance_models import Account, Transaction
+
+
+def account_id_ranges(session: Session, chunk_size: int) -> Iterator[Tuple[int, int, int]]:
+    """Границы (first_id, last_id) и размер очередной пачки счетов, по индексу первичного ключа."""
+    last_id = 0
+    while True:
+        ids = session.execute(
+            select(Account.id).where(Account.id > last_id).order_by(Account.id).limit(chunk_size)
+        ).scalars().all()
+        session.rollback()
+        if not ids:
+            return
+        yield ids[0], ids[-1], len(ids)
+        last_id = ids[-1]
+
+
+def has_opening_balance(session: Session) -> bool:
+    columns = inspect(session.connection()).get_columns(Account.__tablename__)
+    return any(column["name"] == "opening_balance" for column in columns)
+
+
+def find_mismatches(session: Session, first_id: int, last_id: int, with_opening: bool = True) -> List[dict]:
+    """
+    Счета из диапазона, где balance расходится с opening_balance + сумма транзакций
+    (без with_opening — просто с суммой транзакций).
+    """
+    totals = (
+        select(Transaction.account_id, func.sum(Transaction.amount).label("total"))
+        .where(Transaction.account_id.between(first_id, last_id))
+        .group_by(Transaction.account_id)
+        .subquery()
+    )
+    expected = func.coalesce(totals.c.total, 0)
+    if with_opening:
+        expected = Account.opening_balance + expected
+    rows = session.execute(
+        select(Account.id, Account.balance, expected.label("expected"))
+        .outerjoin(totals, totals.c.account_id == Account.id)
+        .where(Account.id.between(first_id, last_id))
+        .where(Account.balance != expected)
+        .order_by(Account.id)
+    ).all()
+    return [
+        {"account_id": row.id, "balance": row.balance, "expected": int(row.expected),
+         "diff": row.balance - int(row.expected)}
+        for row in rows
+    ]
+
+
+def fix_balances(session: Session, account_ids: List[int]) -> int:
+    """
+    Пересчитывает баланс указанных счетов. Сначала блокируем строки (FOR UPDATE в Postgres):
+    параллельный adjust_balance либо уже закоммичен и попадёт в сумму, либо дождётся нас
+    и прибавит свою дельту к уже исправленному значению.
+    """
+    if session.bind.dialect.name == "postgresql":
+        session.execute(select(Account.id).where(Account.id.in_(account_ids)).with_for_update())
+    result = session.execute(
+        update(Account)
+        .where(Account.id.in_(account_ids))
+        .values(balance=Account.opening_balance + transactions_total(Account.id))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def orphaned_transactions(session: Session) -> int:
+    """Транзакции со ссылкой на удалённый счёт: их сумма уже ни в какой баланс не попадёт."""
+    return session.execute(
+        select(func.count())
+        .select_from(Transaction)
+        .outerjoin(Account, Account.id == Transaction.account_id)
+        .where(Transaction.account_id.is_not(None), Account.id.is_(None))
+    ).scalar_one()
+
+
+def reconcile(session: Session, fix: bool = False, chunk_size: int = 1000, pause: float = 0.0,
+              limit_report: Optional[int] = 100) -> dict:
+    with_opening = has_opening_balance(session)
+    session.rollback()
+    if fix and not with_opening:
+        raise ValueError("account.opening_balance is missing: apply the migrations before --fix")
+
+    report = {"accounts_checked": 0, "mismatched": 0, "fixed": 0, "total_diff": 0, "accounts": []}
+    for first_id, last_id, count in account_id_ranges(session, chunk_size):
+        mismatches = find_mismatches(session, first_id, last_id, with_opening)
+        if fix and mismatches:
+            report["fixed"] += fix_balances(session, [item["account_id"] for item in mismatches])
+            session.commit()
+        else:
+            session.rollback()
+
+        report["accounts_checked"] += count
+        report["mismatched"] += len(mismatches)
+        report["total_diff"] += sum(item["diff"] for item in mismatches)
+        report["accounts"].extend(mismatches)
+        if pause:
+            time.sleep(pause)
+
+    report["orphaned_transactions"] = orphaned_transactions(session)
+    session.rollback()
+    # В отчёт — первые limit_report расхождений, счётчики при этом полные
+    if limit_report is not None:
+        report["accounts"] = report["accounts"][:limit_report]
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from app.core.money import from_minor
+    from app.db.connection import engine
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fix", action="store_true", help="исправить расхождения, а не только показать")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.0, help="пауза между пачками, секунд")
+    parser.add_argument("--json", action="store_true", help="отчёт в JSON (суммы в минорных единицах)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with Session(engine) as session:
+        try:
+            report = reconcile(session, fix=args.fix, chunk_size=args.chunk_size, pause=args.pause)
+        except ValueError as exc:
+            raise SystemExit(str(exc))
+    report["seconds"] = round(time.perf_counter() - started, 2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for item in report["accounts"]:
+            print(f"account {item['account_id']}: balance {from_minor(item['balance'])}, "
+                  f"expected {from_minor(item['expected'])}, diff {from_minor(item['diff'])}")
+        print(f"checked {report['accounts_checked']} accounts in {report['seconds']}s: "
+              f"{report['mismatched']} mismatched, {report['fixed']} fixed, "
+              f"{report['orphaned_transactions']} transactions point to deleted accounts")
+    if report["mismatched"] and not args.fix:
+        raise SystemExit(1)
@@ -0,0 +1,52 @@
+from typing import List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import exists, select
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.models.finance_models import Account, Category, User
+
+# Имя ссылки -> модель и текст 404, как раньше отдавали роутеры
+REFERENCES = {
+    "user": (User, "User not found"),
+    "category": (Category, "Category not found"),
+    "account": (Account, "Account not found"),
+}
+
+
+def missing_references(session: Session, **ids: Optional[int]) -> List[str]:
+    """
+    Проверяет все ссылки одним запросом: SELECT EXISTS(...) AS user, EXISTS(...) AS category, ...
+    None пропускается (необязательная ссылка). Возвращает имена ненайденных в порядке аргументов.
+    """
+    checks = [(name, ref_id) for name, ref_id in ids.items() if ref_id is not None]
+    if not checks:
+        return []
+    stmt = select(*[
+        exists().where(REFERENCES[name][0].id == ref_id).label(name)
+        for name, ref_id in checks
+    ])
+    row = session.execute(stmt).one()
+    return [name for name, _ in checks if not row._mapping[name]]
+
+
+def ensure_references(session: Session, detail: Optional[str] = None, **ids: Optional[int]) -> None:
+    """404 на первую ненайденную ссылку; detail заменяет стандартный текст ошибки."""
+    missing = missing_references(session, **ids)
+    if missing:
+        raise HTTPException(status_code=404, detail=detail or REFERENCES[missing[0]][1])
+
+
+def is_unique_violation(exc: IntegrityError) -> bool:
+    """
+    Нарушен именно уникальный индекс (а не NOT NULL или внешний ключ):
+    SQLSTATE 23505 в Postgres (psycopg2 — pgcode, asyncpg — sqlstate), текст ошибки в SQLite.
+    """
+    orig = exc.orig
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if code is None:
+        code = getattr(getattr(orig, "__cause__", None), "sqlstate", None)
+    if code is not None:
+        return code == "23505"
+    return "UNIQUE constraint failed" in str(orig)
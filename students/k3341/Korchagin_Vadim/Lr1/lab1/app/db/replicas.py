@@ -0,0 +1,117 @@
+"""
+Чтение с реплик с гарантией read-your-writes.
+
+Эндпоинты только на чтение берут сессию через get_read_session (app/db/connection.py),
+и запрос уходит на очередную реплику по кругу. Клиент, который недавно писал
+(успешный POST/PUT/PATCH/DELETE), ещё DB_REPLICA_STICKY_SECONDS читает с основной базы —
+иначе из-за лага репликации он может не увидеть собственную запись.
+
+Клиента узнаём двумя способами: по cookie, которую middleware ставит на ответ записи
+(работает между воркерами uvicorn), и по пользователю из JWT — для клиентов без cookie.
+"""
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from app.core import config
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+STICKY_COOKIE = "pr1_primary_until"
+
+
+class RoundRobin:
+    """Номер очередной реплики; счётчик общий для всех потоков и корутин."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            return next(self._counter) % self.size
+
+
+class RecentWrites:
+    """
+    Ключи клиентов, писавших за последние ttl секунд. Ключи лежат в порядке
+    последней записи, поэтому устаревшие и лишние сверх max_size снимаются с начала.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 100_000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._until = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._until[key] = now + self.ttl
+            self._until.move_to_end(key)
+            while self._until:
+                oldest_key, oldest_until = next(iter(self._until.items()))
+                if oldest_until > now and len(self._until) <= self.max_size:
+                    break
+                del self._until[oldest_key]
+
+    def active(self, key: str) -> bool:
+        with self._lock:
+            until = self._until.get(key)
+        return until is not None and until > time.monotonic()
+
+
+recent_writes = RecentWrites(config.DB_REPLICA_STICKY_SECONDS)
+
+
+def writer_key(request: Request) -> Optional[str]:
+    """Пользователь из Bearer-токена; без токена или с невалидным — None."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    # Импорт здесь: app.core.auth сам импортирует app.db.connection
+    from app.core.auth import decode_access_token
+    try:
+        return f"user:{decode_access_token(token)}"
+    except HTTPException:
+        return None
+
+
+def reads_from_primary(request: Request) -> bool:
+    until = request.cookies.get(STICKY_COOKIE)
+    if until:
+        try:
+            if float(until) > time.time():
+                return True
+        except ValueError:
+            pass
+    key = writer_key(request)
+    return key is not None and recent_writes.active(key)
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """
+    После успешной записи помечает клиента: cookie с моментом, до которого читать
+    с основной базы, и отметка по пользователю из токена. В X-DB-Target — куда ушло чтение.
+    """
+    response = await call_next(request)
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        key = writer_key(request)
+        if key is not None:
+            recent_writes.mark(key)
+        response.set_cookie(
+            STICKY_COOKIE,
+            f"{time.time() + config.DB_REPLICA_STICKY_SECONDS:.3f}",
+            max_age=math.ceil(config.DB_REPLICA_STICKY_SECONDS),
+            httponly=True,
+            samesite="lax",
+        )
+    target = getattr(request.state, "db_target", None)
+    if target is not None:
+        response.headers["X-DB-Target"] = target
+    return response
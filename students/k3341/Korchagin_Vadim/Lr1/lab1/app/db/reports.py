@@ -0,0 +1,269 @@
+"""
+Месячный финансовый отчёт: доходы, расходы, чистый поток и топ категорий расходов.
+Всё считается GROUP BY-запросами в БД; снапшот закрытых месяцев — опционально.
+
+    python -m app.db.reports          # обновить прошлый месяц и досчитать недостающие
+    python -m app.db.reports --full   # пересчитать снапшот за всю историю
+"""
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, and_, case, cast, delete, func, or_, select
+from sqlmodel import Session
+
+from app.db.spending import month_start, month_start_expr
+from app.models.finance_models import Category, MonthlySummarySnapshot, Transaction
+
+HISTORY_START = date(1970, 1, 1)
+# Сколько категорий хранится в снапшоте на месяц
+SNAPSHOT_TOP_N = 5
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def as_date(value) -> date:
+    # SQLite отдаёт date(..., 'start of month') строкой
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def compute_summaries(
+    session: Session, date_from: date, date_to: date,
+    user_id: Optional[int] = None, currency: Optional[str] = None, top_n: int = 3
+) -> Dict[Tuple[int, str, date], dict]:
+    """
+    Сводка по месяцам в [date_from, date_to) для одного или всех пользователей.
+    Суммы разных валют не складываются: сводка строится отдельно по каждой валюте
+    (или только по currency). Возвращает {(user_id, currency, period): {...}}
+    с суммами в минорных единицах.
+    """
+    trans = Transaction.__table__
+    period = month_start_expr(session.bind.dialect.name, trans.c.created_at).label("period")
+    filters = [
+        trans.c.created_at >= datetime.combine(date_from, time.min),
+        trans.c.created_at < datetime.combine(date_to, time.min),
+    ]
+    if user_id is not None:
+        filters.append(trans.c.user_id == user_id)
+    if currency is not None:
+        filters.append(trans.c.currency == currency)
+
+    totals = (
+        select(
+            trans.c.user_id,
+            trans.c.currency,
+            period,
+            cast(func.sum(case((trans.c.amount > 0, trans.c.amount), else_=0)), BigInteger).label("income"),
+            cast(func.sum(case((trans.c.amount < 0, -trans.c.amount), else_=0)), BigInteger).label("expenses"),
+            cast(func.sum(trans.c.amount), BigInteger).label("net"),
+        )
+        .where(*filters)
+        .group_by(trans.c.user_id, trans.c.currency, period)
+    )
+
+    by_category = (
+        select(
+            trans.c.user_id,
+            trans.c.currency,
+            period,
+            trans.c.category_id,
+            cast(func.sum(-trans.c.amount), BigInteger).label("expenses"),
+        )
+        .where(*filters, trans.c.amount < 0)
+        .group_by(trans.c.user_id, trans.c.currency, period, trans.c.category_id)
+        .subquery()
+    )
+    category = Category.__table__
+    ranked = (
+        select(
+            by_category,
+            category.c.name,
+            func.row_number().over(
+                partition_by=(by_category.c.user_id, by_category.c.currency, by_category.c.period),
+                order_by=(by_category.c.expenses.desc(), by_category.c.category_id)
+            ).label("rank"),
+        )
+        .join(category, category.c.id == by_category.c.category_id)
+        .subquery()
+    )
+    top = select(ranked).where(ranked.c.rank <= top_n).order_by(ranked.c.rank)
+
+    result = {}
+    for row in session.execute(totals):
+        key = (row.user_id, row.currency, as_date(row.period))
+        result[key] = {
+            "period": key[2],
+            "income": int(row.income),
+            "expenses": int(row.expenses),
+            "net": int(row.net),
+            "top_categories": [],
+        }
+    for row in session.execute(top):
+        summary = result.get((row.user_id, row.currency, as_date(row.period)))
+        if summary is not None:
+            summary["top_categories"].append(
+                {"category_id": row.category_id, "name": row.name, "expenses": int(row.expenses)}
+            )
+    return result
+
+
+def missing_ranges(periods: Iterable[date], date_from: date, date_to: date) -> List[Tuple[date, date]]:
+    """Месяцы из [date_from, date_to), которых нет в periods, склеенные в непрерывные диапазоны."""
+    present = set(periods)
+    ranges = []
+    month = date_from
+    while month < date_to:
+        if month not in present:
+            if ranges and ranges[-1][1] == month:
+                ranges[-1] = (ranges[-1][0], add_months(month, 1))
+            else:
+                ranges.append((month, add_months(month, 1)))
+        month = add_months(month, 1)
+    return ranges
+
+
+def snapshot_summaries(
+    session: Session, user_id: int, currency: str, date_from: date, date_to: date
+) -> Tuple[list, List[Tuple[date, date]]]:
+    """
+    Месяцы из снапшота и диапазоны [from, to) из [date_from, date_to), которых в снапшоте нет
+    (ещё не посчитаны или сброшены правкой старой транзакции) — их отчёт досчитывает вживую.
+    """
+    rows = session.exec(
+        select(MonthlySummarySnapshot)
+        .where(
+            MonthlySummarySnapshot.user_id == user_id,
+            MonthlySummarySnapshot.currency == currency,
+            MonthlySummarySnapshot.period >= date_from,
+            MonthlySummarySnapshot.period < date_to,
+        )
+        .order_by(MonthlySummarySnapshot.period)
+    ).scalars().all()
+    # Нулевая строка — месяц без транзакций: в ответ не попадает, как и при живом расчёте
+    summaries = [
+        {
+            "period": row.period,
+            "income": row.income,
+            "expenses": row.expenses,
+            "net": row.net,
+            "top_categories": row.top_categories,
+        }
+        for row in rows
+        if row.income or row.expenses or row.top_categories
+    ]
+    return summaries, missing_ranges((row.period for row in rows), date_from, date_to)
+
+
+def invalidate_snapshots(session: Session, keys: Iterable[Tuple[int, str, datetime]]) -> None:
+    """
+    Сбрасывает снапшоты закрытых месяцев, которые задела правка или удаление транзакции.
+    keys — (user_id, currency, created_at). До следующего refresh_snapshots
+    эти месяцы считаются вживую. Коммит — за вызывающим кодом.
+    """
+    current_month = datetime.utcnow().date().replace(day=1)
+    closed = {
+        (user_id, currency, month_start(created_at))
+        for user_id, currency, created_at in keys
+        if month_start(created_at) < current_month
+    }
+    if not closed:
+        return
+    table = MonthlySummarySnapshot.__table__
+    session.execute(delete(table).where(or_(*[
+        and_(table.c.user_id == user_id, table.c.currency == currency, table.c.period == period)
+        for user_id, currency, period in closed
+    ])))
+
+
+def first_months(session: Session, until: date) -> Dict[Tuple[int, str], date]:
+    """Первый месяц с транзакциями до until для каждой пары (user_id, currency)."""
+    trans = Transaction.__table__
+    period = month_start_expr(session.bind.dialect.name, trans.c.created_at)
+    rows = session.execute(
+        select(trans.c.user_id, trans.c.currency, func.min(period).label("first"))
+        .where(trans.c.created_at < datetime.combine(until, time.min))
+        .group_by(trans.c.user_id, trans.c.currency)
+    )
+    return {(row.user_id, row.currency): as_date(row.first) for row in rows}
+
+
+def stale_ranges(session: Session, until: date) -> List[Tuple[date, date]]:
+    """
+    Диапазоны закрытых месяцев до until, где хотя бы у одной пары (user_id, currency)
+    нет строки снапшота: ещё не посчитаны или сброшены invalidate_snapshots.
+    """
+    table = MonthlySummarySnapshot.__table__
+    present = {}
+    for row in session.execute(select(table.c.user_id, table.c.currency, table.c.period)):
+        present.setdefault((row.user_id, row.currency), set()).add(row.period)
+
+    stale = set()
+    for key, first in first_months(session, until).items():
+        for range_from, range_to in missing_ranges(present.get(key, ()), first, until):
+            month = range_from
+            while month < range_to:
+                stale.add(month)
+                month = add_months(month, 1)
+
+    ranges = []
+    for month in sorted(stale):
+        if ranges and ranges[-1][1] == month:
+            ranges[-1] = (ranges[-1][0], add_months(month, 1))
+        else:
+            ranges.append((month, add_months(month, 1)))
+    return ranges
+
+
+def refresh_snapshots(session: Session, since: date, until: date, top_n: int = SNAPSHOT_TOP_N) -> int:
+    """
+    Пересчитывает снапшот за закрытые месяцы [since, until) для всех пользователей
+    в одной транзакции: удаляем старые строки периода и вставляем новые.
+    Месяцы без транзакций (после первой транзакции пары) получают нулевую строку,
+    чтобы отчёт не считал их вживую.
+    """
+    summaries = compute_summaries(session, since, until, top_n=top_n)
+    for key, first in first_months(session, until).items():
+        month = max(first, since)
+        while month < until:
+            summaries.setdefault((*key, month), {
+                "period": month, "income": 0, "expenses": 0, "net": 0, "top_categories": [],
+            })
+            month = add_months(month, 1)
+
+    table = MonthlySummarySnapshot.__table__
+    session.execute(delete(table).where(table.c.period >= since, table.c.period < until))
+    now = datetime.utcnow()
+    if summaries:
+        session.execute(table.insert(), [
+            {"user_id": user_id, "currency": currency, "refreshed_at": now, **summary}
+            for (user_id, currency, _), summary in summaries.items()
+        ])
+    session.commit()
+    return len(summaries)
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.db.connection import engine
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true", help="пересчитать всю историю")
+    args = parser.parse_args()
+
+    current_month = datetime.utcnow().date().replace(day=1)
+    with Session(engine) as session:
+        if args.full:
+            ranges = [(HISTORY_START, current_month)]
+        else:
+            # Прошлый месяц — всегда, плюс всё, чего в снапшоте не хватает
+            last_month = add_months(current_month, -1)
+            ranges = stale_ranges(session, last_month) + [(last_month, current_month)]
+        for since, until in ranges:
+            rows = refresh_snapshots(session, since, until)
+            print(f"monthlysummarysnapshot refreshed {since}..{until}: {rows} rows")
@@ -0,0 +1,128 @@
+"""
+Полнотекстовый поиск по Transaction.description.
+
+Postgres: колонка search_vector (tsvector) с GIN-индексом, её заполняет триггер
+на INSERT/UPDATE description. SQLite: внешняя FTS5-таблица transaction_fts
+поверх "transaction", синхронизируется триггерами. В модели этих объектов нет —
+их создаёт миграция, а для create_all (тесты, локальный запуск) — install_search().
+"""
+import re
+from typing import List, Tuple
+
+from sqlalchemy import column, func, inspect, literal_column, select, table
+from sqlmodel import Session
+
+from app.models.finance_models import Transaction
+
+# Без стемминга: описания смешанные (русский/английский), 'simple' только приводит к нижнему регистру
+TS_CONFIG = "simple"
+
+# Объекты поиска вне метаданных SQLModel — их не трогает autogenerate в alembic
+SEARCH_COLUMNS = {("transaction", "search_vector")}
+SEARCH_TABLES = {"transaction_fts"} | {f"transaction_fts_{suffix}" for suffix in ("data", "idx", "docsize", "config")}
+
+POSTGRES_DDL = (
+    'ALTER TABLE "transaction" ADD COLUMN IF NOT EXISTS search_vector tsvector',
+    f"""
+    CREATE OR REPLACE FUNCTION transaction_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector('{TS_CONFIG}', coalesce(NEW.description, ''));
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    'DROP TRIGGER IF EXISTS transaction_search_vector_trigger ON "transaction"',
+    """
+    CREATE TRIGGER transaction_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF description ON "transaction"
+    FOR EACH ROW EXECUTE FUNCTION transaction_search_vector_update()
+    """,
+    f"""
+    UPDATE "transaction" SET search_vector = to_tsvector('{TS_CONFIG}', coalesce(description, ''))
+    WHERE search_vector IS NULL
+    """,
+    'CREATE INDEX IF NOT EXISTS ix_transaction_search_vector ON "transaction" USING gin (search_vector)',
+)
+
+SQLITE_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transaction_fts
+    USING fts5(description, content='transaction', content_rowid='id')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transaction_fts_insert AFTER INSERT ON "transaction" BEGIN
+        INSERT INTO transaction_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transaction_fts_delete AFTER DELETE ON "transaction" BEGIN
+        INSERT INTO transaction_fts(transaction_fts, rowid, description) VALUES ('delete', old.id, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transaction_fts_update AFTER UPDATE OF description ON "transaction" BEGIN
+        INSERT INTO transaction_fts(transaction_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        INSERT INTO transaction_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    # Проиндексировать строки, которые были до появления триггеров
+    "INSERT INTO transaction_fts(transaction_fts) VALUES ('rebuild')",
+)
+
+
+def search_installed(connection) -> bool:
+    if connection.dialect.name == "postgresql":
+        return "search_vector" in {col["name"] for col in inspect(connection).get_columns("transaction")}
+    return inspect(connection).has_table("transaction_fts")
+
+
+def install_search(connection) -> None:
+    """
+    Создаёт поисковые объекты для текущего диалекта и индексирует уже лежащие строки.
+    Если они уже есть, ничего не делает: полная переиндексация на каждом старте не нужна.
+    """
+    if search_installed(connection):
+        return
+    statements = POSTGRES_DDL if connection.dialect.name == "postgresql" else SQLITE_DDL
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def search_terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def search_transactions(
+    session: Session, user_id: int, query: str, limit: int, offset: int
+) -> List[Tuple[Transaction, float]]:
+    """
+    Транзакции пользователя, подходящие под все слова запроса, от самых релевантных.
+    Возвращает пары (транзакция, rank); чем больше rank, тем лучше совпадение.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    if session.bind.dialect.name == "postgresql":
+        tsquery = func.plainto_tsquery(TS_CONFIG, " ".join(terms))
+        search_vector = literal_column('"transaction".search_vector')
+        rank = func.ts_rank(search_vector, tsquery)
+        stmt = select(Transaction, rank.label("rank")).where(search_vector.op("@@")(tsquery))
+    else:
+        # Каждое слово в кавычках: спецсимволы FTS5 (AND, *, ") из запроса не ломают синтаксис
+        fts = table("transaction_fts", column("rowid"))
+        # bm25 тем меньше, чем лучше совпадение — меняем знак, чтобы rank рос с релевантностью
+        rank = -func.bm25(literal_column("transaction_fts"))
+        stmt = (
+            select(Transaction, rank.label("rank"))
+            .join(fts, fts.c.rowid == Transaction.id)
+            .where(literal_column("transaction_fts").op("MATCH")(" ".join(f'"{term}"' for term in terms)))
+        )
+
+    stmt = (
+        stmt.where(Transaction.user_id == user_id)
+        .order_by(literal_column("rank").desc(), Transaction.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    return [(trans, float(rank)) for trans, rank in session.execute(stmt).all()]
@@ -0,0 +1,273 @@
+"""
+Синтетические данные для воспроизведения нагрузки как в проде.
+
+Немногие «тяжёлые» пользователи дают большую часть транзакций (распределение Ципфа),
+траты сезонные (декабрь выше, начало года ниже, выходные выше будних), категорий много
+и они тоже неравномерны, у каждого пользователя ежемесячная зарплата. Строки генерируются
+пачками по столбцам и грузятся через COPY (Postgres + psycopg2) или executemany
+сырым DBAPI, без ORM. При одних --seed и --batch-size результат всегда один и тот же.
+
+    python -m app.db.seed --users 5000 --transactions 1000000
+    python -m app.db.seed --transactions 5000000 --reset --seed 7
+"""
+import csv
+import io
+import math
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Sequence
+
+from sqlalchemy import delete, text
+from sqlmodel import Session, SQLModel
+
+from app.core.hashing import password_context
+from app.db.spending import rebuild_spending
+from app.models.finance_models import (
+    Account, Budget, Category, CategorySpending, Goal, MonthlySummarySnapshot,
+    Transaction, User, UserCategoryPreference,
+)
+
+SALARY_CATEGORY_ID = 1
+CATEGORY_NAMES = (
+    "Salary", "Groceries", "Cafe", "Transport", "Taxi", "Rent", "Utilities", "Mobile",
+    "Internet", "Clothes", "Shoes", "Pharmacy", "Doctor", "Sport", "Cinema", "Books",
+    "Games", "Subscriptions", "Travel", "Hotels", "Flights", "Gifts", "Pets", "Kids",
+    "Education", "Beauty", "Electronics", "Home", "Furniture", "Repair", "Car", "Fuel",
+    "Parking", "Insurance", "Taxes", "Charity", "Alcohol", "Fast food", "Delivery", "Other",
+)
+# Сезонность по месяцам: январь-февраль проседают после праздников, декабрь — пик
+MONTH_WEIGHTS = (0.8, 0.85, 0.95, 1.0, 1.05, 1.1, 1.15, 1.1, 1.0, 1.0, 1.1, 1.45)
+WEEKDAY_WEIGHTS = (0.9, 0.9, 0.95, 1.0, 1.2, 1.35, 1.1)
+MERCHANTS = ("card payment", "online", "cash", "subscription", "transfer", None)
+TRANSACTION_COLUMNS = ("user_id", "category_id", "account_id", "amount", "currency", "description", "created_at")
+# Формат SQLAlchemy для DateTime в SQLite: строки сравниваются как текст, микросекунды обязательны
+SQLITE_DATETIME = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def cumulative(weights: Sequence[float]) -> List[float]:
+    total, result = 0.0, []
+    for weight in weights:
+        total += weight
+        result.append(total)
+    return result
+
+
+class Dataset:
+    """Параметры набора и распределения, из которых строятся пачки строк."""
+
+    def __init__(self, users: int, transactions: int, categories: int, accounts_per_user: int,
+                 start: date, months: int, skew: float, seed: int):
+        self.users = users
+        self.transactions = transactions
+        self.categories = max(2, min(categories, len(CATEGORY_NAMES)))
+        self.accounts_per_user = accounts_per_user
+        self.start = start
+        self.months = months
+        self.seed = seed
+
+        rnd = random.Random(f"{seed}-dataset")
+        self.user_ids = list(range(1, users + 1))
+        # Ципф: вес пользователя ранга r — 1 / r^skew; ранги перемешаны, чтобы тяжёлые не шли подряд
+        ranks = list(range(1, users + 1))
+        rnd.shuffle(ranks)
+        self.user_cum = cumulative([1 / rank ** skew for rank in ranks])
+
+        self.expense_ids = list(range(SALARY_CATEGORY_ID + 1, self.categories + 1))
+        self.expense_cum = cumulative([1 / rank ** 0.9 for rank in range(1, len(self.expense_ids) + 1)])
+        # Типичный чек категории в копейках: от 100 ₽ до ~20 000 ₽
+        self.category_scale = {cid: int(10_000 * math.exp(rnd.uniform(0, 5.3))) for cid in self.expense_ids}
+
+        self.end = add_months(start, months)
+        self.days = (self.end - start).days
+        self.day_cum = cumulative([
+            MONTH_WEIGHTS[day.month - 1] * WEEKDAY_WEIGHTS[day.weekday()]
+            for day in (start + timedelta(days=i) for i in range(self.days))
+        ])
+        self.salary = {user_id: rnd.randint(40_000, 400_000) * 100 for user_id in self.user_ids}
+
+    def account_for(self, user_id: int, rnd: random.Random) -> int:
+        return (user_id - 1) * self.accounts_per_user + 1 + rnd.randrange(self.accounts_per_user)
+
+    def expense_batch(self, batch_no: int, size: int) -> List[tuple]:
+        # У каждой пачки свой генератор от (seed, номер пачки)
+        rnd = random.Random(f"{self.seed}-expenses-{batch_no}")
+        users = rnd.choices(self.user_ids, cum_weights=self.user_cum, k=size)
+        categories = rnd.choices(self.expense_ids, cum_weights=self.expense_cum, k=size)
+        days = rnd.choices(range(self.days), cum_weights=self.day_cum, k=size)
+        descriptions = rnd.choices(MERCHANTS, k=size)
+        start = datetime.combine(self.start, datetime.min.time())
+        return [
+            (
+                user_id, category_id, self.account_for(user_id, rnd),
+                -max(100, int(self.category_scale[category_id] * rnd.lognormvariate(0, 0.6))),
+                "RUB", description,
+                start + timedelta(days=day, seconds=rnd.randrange(7 * 3600, 24 * 3600)),
+            )
+            for user_id, category_id, day, description in zip(users, categories, days, descriptions)
+        ]
+
+    def salary_rows(self) -> Iterator[tuple]:
+        rnd = random.Random(f"{self.seed}-salary")
+        for month in range(self.months):
+            payday = datetime.combine(add_months(self.start, month), datetime.min.time()) + timedelta(days=4, hours=10)
+            for user_id in self.user_ids:
+                yield (
+                    user_id, SALARY_CATEGORY_ID, (user_id - 1) * self.accounts_per_user + 1,
+                    self.salary[user_id], "RUB", "salary", payday + timedelta(minutes=rnd.randrange(480)),
+                )
+
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def load_rows(connection, table_name: str, columns: Sequence[str], rows: List[tuple]) -> None:
+    """COPY для psycopg2, иначе executemany сырым курсором — в обход ORM и компиляции выражений."""
+    raw = connection.connection
+    cursor = raw.cursor()
+    try:
+        if connection.dialect.driver == "psycopg2":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow(["" if value is None else value for value in row])
+            buffer.seek(0)
+            cursor.copy_expert(
+                f'COPY "{table_name}" ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv, NULL \'\')', buffer
+            )
+        else:
+            if connection.dialect.name == "sqlite":
+                rows = [
+                    tuple(value.strftime(SQLITE_DATETIME) if isinstance(value, datetime) else value for value in row)
+                    for row in rows
+                ]
+            placeholders = ", ".join(["?" if connection.dialect.paramstyle == "qmark" else "%s"] * len(columns))
+            cursor.executemany(f'INSERT INTO "{table_name}" ({", ".join(columns)}) VALUES ({placeholders})', rows)
+    finally:
+        cursor.close()
+
+
+# Таблицы, куда сид пишет id явно
+EXPLICIT_ID_MODELS = (User, Category, Account)
+RESET_MODELS = (UserCategoryPreference, Budget, Goal, CategorySpending, MonthlySummarySnapshot,
+                Transaction, Account, Category, User)
+
+
+def reset(session: Session) -> None:
+    if session.bind.dialect.name == "postgresql":
+        # TRUNCATE заодно перезапускает serial-последовательности: id снова с 1
+        tables = ", ".join(f'"{model.__tablename__}"' for model in RESET_MODELS)
+        session.execute(text(f"TRUNCATE {tables} RESTART IDENTITY"))
+    else:
+        for model in RESET_MODELS:
+            session.execute(delete(model))
+    session.commit()
+
+
+def sync_sequences(connection) -> None:
+    """
+    Postgres: вставка с явными id не двигает serial-последовательности, и первый
+    INSERT через API получил бы уже занятый id. Ставим последовательность на max(id)
+    (на пустой таблице — так, чтобы следующий id был 1).
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    for model in EXPLICIT_ID_MODELS:
+        table = f'"{model.__tablename__}"'
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT max(id) FROM {table}), 1), (SELECT max(id) FROM {table}) IS NOT NULL)"
+        ))
+
+
+def seed(engine, dataset: Dataset, password: str = "password", batch_size: int = 100_000,
+         progress: bool = False) -> dict:
+    SQLModel.metadata.create_all(engine)
+    started = time.perf_counter()
+    # Один хэш на всех: bcrypt на каждого пользователя занял бы больше времени, чем весь сид
+    hashed = password_context.hash(password)
+
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert(), [
+            {"id": u, "username": f"user{u}", "email": f"user{u}@example.com", "hashed_password": hashed}
+            for u in dataset.user_ids
+        ])
+        connection.execute(Category.__table__.insert(), [
+            {"id": cid, "name": CATEGORY_NAMES[cid - 1]} for cid in range(1, dataset.categories + 1)
+        ])
+        connection.execute(Account.__table__.insert(), [
+            {"id": (u - 1) * dataset.accounts_per_user + a, "user_id": u, "name": f"account {a}",
+             "balance": 0, "currency": "RUB"}
+            for u in dataset.user_ids for a in range(1, dataset.accounts_per_user + 1)
+        ])
+        rnd = random.Random(f"{dataset.seed}-budgets")
+        connection.execute(Budget.__table__.insert(), [
+            {"user_id": u, "category_id": cid, "limit_amount": dataset.category_scale[cid] * 30, "currency": "RUB"}
+            for u in dataset.user_ids for cid in rnd.sample(dataset.expense_ids, min(3, len(dataset.expense_ids)))
+        ])
+        sync_sequences(connection)
+
+    loaded = 0
+    salary = list(dataset.salary_rows())
+    for offset in range(0, len(salary), batch_size):
+        with engine.begin() as connection:
+            load_rows(connection, Transaction.__tablename__, TRANSACTION_COLUMNS, salary[offset:offset + batch_size])
+    loaded += len(salary)
+
+    for batch_no, offset in enumerate(range(0, dataset.transactions, batch_size)):
+        rows = dataset.expense_batch(batch_no, min(batch_size, dataset.transactions - offset))
+        with engine.begin() as connection:
+            load_rows(connection, Transaction.__tablename__, TRANSACTION_COLUMNS, rows)
+        loaded += len(rows)
+        if progress:
+            elapsed = time.perf_counter() - started
+            print(f"{loaded} rows, {loaded / elapsed * 60:,.0f} rows/min")
+
+    # Балансы и агрегаты — из загруженных строк, как будто всё пришло через API
+    with engine.begin() as connection:
+        connection.execute(text(
+            'UPDATE account SET balance = opening_balance + (SELECT COALESCE(SUM(t.amount), 0) FROM "transaction" t '
+            "WHERE t.account_id = account.id)"
+        ))
+    with Session(engine) as session:
+        rebuild_spending(session)
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("ANALYZE"))
+
+    elapsed = time.perf_counter() - started
+    return {"transactions": loaded, "seconds": round(elapsed, 1), "rows_per_minute": int(loaded / elapsed * 60)}
+
+
+if __name__ == "__main__":
+    import argparse
+    from sqlmodel import create_engine
+    from app.core import config
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=config.DB_URL, help="по умолчанию PR1_DB_URL")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--transactions", type=int, default=1_000_000, help="расходов; зарплаты добавляются сверху")
+    parser.add_argument("--categories", type=int, default=len(CATEGORY_NAMES))
+    parser.add_argument("--accounts-per-user", type=int, default=2)
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2021, 1, 1))
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--skew", type=float, default=1.1, help="показатель Ципфа для активности пользователей")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--password", default="password", help="пароль всех пользователей")
+    parser.add_argument("--reset", action="store_true", help="очистить таблицы перед загрузкой")
+    args = parser.parse_args()
+
+    engine = create_engine(args.db)
+    if args.reset:
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            reset(session)
+    dataset = Dataset(args.users, args.transactions, args.categories, args.accounts_per_user,
+                      args.start, args.months, args.skew, args.seed)
+    result = seed(engine, dataset, args.password, args.batch_size, progress=True)
+    print(f"seeded {result['transactions']} transactions in {result['seconds']}s "
+          f"({result['rows_per_minute']:,} rows/min)")
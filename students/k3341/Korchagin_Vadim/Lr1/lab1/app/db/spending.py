@@ -0,0 +1,107 @@
+"""
+Инкрементальные агрегаты трат (CategorySpending) и их полная пересборка.
+
+    python -m app.db.spending   # пересчитать агрегаты из сырых транзакций
+"""
+from collections import defaultdict
+from datetime import datetime, date
+from typing import Dict, Tuple
+
+from sqlalchemy import Date, delete, func, select, cast
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from app.models.finance_models import CategorySpending, Transaction
+
+
+def month_start(moment: datetime) -> date:
+    return moment.date().replace(day=1)
+
+
+def month_start_expr(dialect_name: str, column):
+    if dialect_name == "sqlite":
+        return func.date(column, "start of month")
+    return cast(func.date_trunc("month", column), Date)
+
+
+def apply_spending_deltas(session: Session, deltas: Dict[Tuple[int, int, date, str], Tuple[int, int]]) -> None:
+    """
+    Прибавляет (сумма, количество) к агрегатам одним upsert-запросом
+    (INSERT ... ON CONFLICT DO UPDATE). Коммит остаётся за вызывающим кодом.
+    """
+    if not deltas:
+        return
+    table = CategorySpending.__table__
+    dialect_insert = sqlite.insert if session.bind.dialect.name == "sqlite" else postgresql.insert
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.category_id, table.c.period, table.c.currency],
+        set_={
+            "total": table.c.total + stmt.excluded.total,
+            "count": table.c.count + stmt.excluded.count,
+        }
+    )
+    session.execute(stmt, [
+        {"user_id": user_id, "category_id": category_id, "period": period, "currency": currency,
+         "total": total, "count": count}
+        for (user_id, category_id, period, currency), (total, count) in deltas.items()
+    ])
+
+
+def apply_spending(
+    session: Session, user_id: int, category_id: int, created_at: datetime, currency: str, amount: int, count: int
+) -> None:
+    apply_spending_deltas(session, {(user_id, category_id, month_start(created_at), currency): (amount, count)})
+
+
+def spent_in_period(
+    session: Session, user_id: int, category_id: int, period: date, currency: str
+) -> Tuple[int, int]:
+    """
+    Потрачено за месяц в валюте currency и число транзакций по агрегату. Расходы хранятся
+    отрицательными суммами (они уменьшают баланс счёта), поэтому меняем знак.
+    """
+    spending = session.get(CategorySpending, (user_id, category_id, period, currency))
+    if spending is None:
+        return 0, 0
+    return max(-spending.total, 0), spending.count
+
+
+def spending_deltas_for(rows) -> Dict[Tuple[int, int, date, str], Tuple[int, int]]:
+    # rows — словари с user_id, category_id, created_at, currency, amount (как в пакетной вставке)
+    totals = defaultdict(lambda: [0, 0])
+    for row in rows:
+        key = (row["user_id"], row["category_id"], month_start(row["created_at"]), row["currency"])
+        totals[key][0] += row["amount"]
+        totals[key][1] += 1
+    return {key: (total, count) for key, (total, count) in totals.items()}
+
+
+def rebuild_spending(session: Session) -> int:
+    """
+    Полная пересборка агрегатов одним INSERT ... SELECT ... GROUP BY.
+    """
+    table = CategorySpending.__table__
+    trans = Transaction.__table__
+    period = month_start_expr(session.bind.dialect.name, trans.c.created_at)
+    aggregated = (
+        select(
+            trans.c.user_id, trans.c.category_id, period, trans.c.currency,
+            func.sum(trans.c.amount), func.count()
+        )
+        .group_by(trans.c.user_id, trans.c.category_id, period, trans.c.currency)
+    )
+    session.execute(delete(table))
+    session.execute(
+        table.insert().from_select(["user_id", "category_id", "period", "currency", "total", "count"], aggregated)
+    )
+    session.commit()
+    return session.execute(select(func.count()).select_from(table)).scalar_one()
+
+
+if __name__ == "__main__":
+    from app.db.connection import engine
+
+    with Session(engine) as session:
+        rows = rebuild_spending(session)
+    print(f"categoryspending rebuilt: {rows} rows")
@@ -0,0 +1,265 @@
+"""
+Общая логика транзакций для sync- и async-роутеров.
+
+Функции записи синхронные и принимают Session: sync-роутер вызывает их напрямую,
+async-роутер — через AsyncSession.run_sync. Так проверка ссылок, изменение баланса
+и агрегатов трат существуют в одном экземпляре, а роутеры отвечают только за I/O.
+"""
+import base64
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import bindparam, insert, tuple_, update
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from app.core.money import to_minor
+from app.core.notifications import publish_transaction_event
+from app.db.balances import adjust_balance
+from app.db.references import ensure_references
+from app.db.reports import invalidate_snapshots
+from app.db.spending import apply_spending, apply_spending_deltas, spending_deltas_for
+from app.models.finance_models import Account, Category, Transaction, User
+from app.schemas.finance_schemas import BulkTransactionError, BulkTransactionResult, CreateTransaction
+from app.schemas.serializers import serialize_transaction
+
+MAX_BULK_ITEMS = 10000
+CURRENCY_MISMATCH = "Transaction currency does not match account currency"
+
+
+def add_to_account(session: Session, account_id: int, amount: int, currency: str) -> None:
+    """
+    adjust_balance с условием на валюту. 0 строк бывает в двух случаях: счёт удалили
+    после ensure_references или у него другая валюта — различаем их отдельным
+    запросом, который выполняется только на этом, ошибочном, пути.
+    """
+    if adjust_balance(session, account_id, amount, currency):
+        return
+    if session.exec(select(Account.id).where(Account.id == account_id)).first() is None:
+        raise HTTPException(status_code=404, detail="Account not found")
+    raise HTTPException(status_code=400, detail=CURRENCY_MISMATCH)
+
+
+# Курсор — это пара (created_at, id) последней отданной строки
+def encode_cursor(created_at: datetime, transaction_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{transaction_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, transaction_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(transaction_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def transactions_page_statement(
+    user_id: Optional[int],
+    account_id: Optional[int],
+    category_id: Optional[int],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    cursor: Optional[str],
+    limit: int,
+):
+    """
+    Keyset-пагинация по (created_at, id): вместо OFFSET продолжаем
+    с последней строки предыдущей страницы, поэтому страница N
+    стоит столько же, сколько первая. Фильтры уходят в WHERE.
+    """
+    stmt = select(Transaction)
+    if user_id is not None:
+        stmt = stmt.where(Transaction.user_id == user_id)
+    if account_id is not None:
+        stmt = stmt.where(Transaction.account_id == account_id)
+    if category_id is not None:
+        stmt = stmt.where(Transaction.category_id == category_id)
+    if date_from is not None:
+        stmt = stmt.where(Transaction.created_at >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Transaction.created_at < date_to)
+    if cursor is not None:
+        last_created_at, last_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(Transaction.created_at, Transaction.id) < tuple_(last_created_at, last_id)
+        )
+    # Берём на одну строку больше, чтобы понять, есть ли следующая страница
+    return stmt.order_by(Transaction.created_at.desc(), Transaction.id.desc()).limit(limit + 1)
+
+
+def transactions_page(rows: list, limit: int) -> dict:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return {"items": serialize_transaction.many(rows), "next_cursor": next_cursor}
+
+
+def transaction_detail_statement(transaction_id: int):
+    return (
+        select(Transaction)
+        .where(Transaction.id == transaction_id)
+        .options(
+            selectinload(Transaction.user),
+            selectinload(Transaction.category),
+            selectinload(Transaction.account)
+        )
+    )
+
+
+def add_transaction(session: Session, trans: CreateTransaction) -> Transaction:
+    """
+    Новая транзакция: ссылки проверяются одним запросом, баланс счёта
+    и агрегат трат меняются в той же транзакции БД. Коммит — за вызывающим кодом.
+    """
+    ensure_references(session, user=trans.user_id, category=trans.category_id, account=trans.account_id)
+
+    new_trans = Transaction(
+        user_id=trans.user_id,
+        category_id=trans.category_id,
+        account_id=trans.account_id,
+        amount=to_minor(trans.amount),
+        currency=trans.currency,
+        description=trans.description
+    )
+    session.add(new_trans)
+
+    # Если транзакция привязана к счёту — атомарно меняем баланс в БД
+    if trans.account_id is not None:
+        add_to_account(session, trans.account_id, new_trans.amount, new_trans.currency)
+
+    apply_spending(
+        session, new_trans.user_id, new_trans.category_id, new_trans.created_at,
+        new_trans.currency, new_trans.amount, 1
+    )
+    return new_trans
+
+
+def change_transaction(session: Session, db_trans: Transaction, data: CreateTransaction) -> None:
+    """
+    1) Возвращаем старую сумму в баланс старого счёта (если был) и убираем её из агрегата трат.
+    2) Обновляем поля и добавляем новую сумму в баланс нового счёта и в агрегат.
+    3) Если месяц транзакции закрыт — сбрасываем его снапшот до и после правки.
+    """
+    # Проверяем новые user / category / account одним запросом
+    ensure_references(session, user=data.user_id, category=data.category_id, account=data.account_id)
+
+    if db_trans.account_id is not None:
+        adjust_balance(session, db_trans.account_id, -db_trans.amount)
+    apply_spending(
+        session, db_trans.user_id, db_trans.category_id, db_trans.created_at,
+        db_trans.currency, -db_trans.amount, -1
+    )
+
+    old_key = (db_trans.user_id, db_trans.currency, db_trans.created_at)
+    db_trans.user_id = data.user_id
+    db_trans.category_id = data.category_id
+    db_trans.account_id = data.account_id
+    db_trans.amount = to_minor(data.amount)
+    db_trans.currency = data.currency
+    db_trans.description = data.description
+
+    if data.account_id is not None:
+        add_to_account(session, data.account_id, db_trans.amount, db_trans.currency)
+    apply_spending(
+        session, db_trans.user_id, db_trans.category_id, db_trans.created_at,
+        db_trans.currency, db_trans.amount, 1
+    )
+    invalidate_snapshots(session, [old_key, (db_trans.user_id, db_trans.currency, db_trans.created_at)])
+    session.add(db_trans)
+
+
+def remove_transaction(session: Session, db_trans: Transaction) -> None:
+    """Удаляем транзакцию и компенсируем её в балансе счёта и в агрегате трат."""
+    if db_trans.account_id is not None:
+        adjust_balance(session, db_trans.account_id, -db_trans.amount)
+    apply_spending(
+        session, db_trans.user_id, db_trans.category_id, db_trans.created_at,
+        db_trans.currency, -db_trans.amount, -1
+    )
+    invalidate_snapshots(session, [(db_trans.user_id, db_trans.currency, db_trans.created_at)])
+    session.delete(db_trans)
+
+
+def existing_ids(session: Session, model, ids: set) -> set:
+    if not ids:
+        return set()
+    return set(session.exec(select(model.id).where(model.id.in_(ids))).all())
+
+
+def ingest_transactions(session: Session, items: List[CreateTransaction]) -> BulkTransactionResult:
+    """
+    Пакетная вставка транзакций:
+    1) по одному IN-запросу на пользователей, категории и счета (счета — вместе с валютой);
+    2) строки с несуществующими ссылками или чужой валютой попадают в errors,
+       остальные вставляются executemany;
+    3) балансы меняются одним UPDATE на счёт с суммой всех его транзакций.
+    Всё выполняется в одной транзакции БД.
+    """
+    user_ids = existing_ids(session, User, {item.user_id for item in items})
+    category_ids = existing_ids(session, Category, {item.category_id for item in items})
+    account_ids = {item.account_id for item in items if item.account_id is not None}
+    account_currencies = dict(session.exec(
+        select(Account.id, Account.currency).where(Account.id.in_(account_ids))
+    ).all()) if account_ids else {}
+
+    rows = []
+    errors = []
+    balance_deltas = defaultdict(int)
+    now = datetime.utcnow()
+
+    for index, item in enumerate(items):
+        if item.user_id not in user_ids:
+            errors.append(BulkTransactionError(index=index, detail="User not found"))
+            continue
+        if item.category_id not in category_ids:
+            errors.append(BulkTransactionError(index=index, detail="Category not found"))
+            continue
+        amount = to_minor(item.amount)
+        if item.account_id is not None:
+            if item.account_id not in account_currencies:
+                errors.append(BulkTransactionError(index=index, detail="Account not found"))
+                continue
+            if account_currencies[item.account_id] != item.currency:
+                errors.append(BulkTransactionError(index=index, detail=CURRENCY_MISMATCH))
+                continue
+            balance_deltas[item.account_id] += amount
+
+        rows.append({
+            "user_id": item.user_id,
+            "category_id": item.category_id,
+            "account_id": item.account_id,
+            "amount": amount,
+            "currency": item.currency,
+            "description": item.description,
+            "created_at": now,
+        })
+
+    if rows:
+        session.execute(insert(Transaction.__table__), rows)
+        apply_spending_deltas(session, spending_deltas_for(rows))
+    if balance_deltas:
+        account_table = Account.__table__
+        session.execute(
+            update(account_table)
+            .where(account_table.c.id == bindparam("account_id"))
+            .values(balance=account_table.c.balance + bindparam("delta")),
+            [{"account_id": acc_id, "delta": delta} for acc_id, delta in balance_deltas.items()]
+        )
+    session.commit()
+
+    return BulkTransactionResult(created=len(rows), errors=errors)
+
+
+def publish_bulk_events(background_tasks: BackgroundTasks, items: List[CreateTransaction], result: BulkTransactionResult) -> None:
+    failed = {error.index for error in result.errors}
+    pairs = {
+        (item.user_id, item.category_id)
+        for index, item in enumerate(items) if index not in failed
+    }
+    for user_id, category_id in pairs:
+        background_tasks.add_task(publish_transaction_event, user_id, category_id)
@@ -1,26 +1,69 @@
+import anyio.to_thread
 from fastapi import FastAPI
-from app.db.connection import init_db
+from fastapi.responses import ORJSONResponse
+from app.db.connection import init_db, db_mode, engine, async_engine, replica_engines, async_replica_engines
+from app.db.query_metrics import install_query_hooks, query_metrics_middleware
+from app.db.replicas import read_your_writes_middleware
+from app.core import config
+from app.core.metrics import MetricsMiddleware
+from app.core.hashing import hashing_pool
+from app.core.notifications import budget_events
 from app.routers import (
     auth_router,
+    async_auth_router,
     users, 
     categories,
     transactions,
     budgets,
     accounts,
     goals,
-    preferences
+    preferences,
+    exports,
+    async_transactions,
+    monitoring,
+    reports,
+    search
 )
 
-app = FastAPI(title="Personal Finance API (with manual Auth)")
+# orjson вместо stdlib json для всех ответов
+app = FastAPI(title="Personal Finance API (with manual Auth)", default_response_class=ORJSONResponse)
 
-app.include_router(auth_router.router)
+# Число запросов к БД и время в них на каждый HTTP-запрос (Server-Timing, /monitoring/queries)
+install_query_hooks(engine)
+if async_engine is not None:
+    install_query_hooks(async_engine.sync_engine)
+for replica in replica_engines:
+    install_query_hooks(replica)
+for replica in async_replica_engines:
+    install_query_hooks(replica.sync_engine)
+app.middleware("http")(query_metrics_middleware)
+# Липкость к основной базе после записи — только если есть реплики
+if replica_engines:
+    app.middleware("http")(read_your_writes_middleware)
+# Добавлен последним — значит внешний: в длительность попадает и работа остальных middleware
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# В async-режиме горячие пути (auth и транзакции) не занимают threadpool
+if db_mode == "async":
+    app.include_router(async_auth_router.router)
+else:
+    app.include_router(auth_router.router)
 app.include_router(users.router)
 app.include_router(categories.router)
-app.include_router(transactions.router)
+if db_mode == "async":
+    app.include_router(async_transactions.router)
+else:
+    app.include_router(transactions.router)
 app.include_router(budgets.router)
 app.include_router(accounts.router)
 app.include_router(goals.router)
 app.include_router(preferences.router)
+app.include_router(exports.router)
+app.include_router(monitoring.router)
+app.include_router(monitoring.metrics_router)
+app.include_router(reports.router)
+app.include_router(search.router)
 
 
 @app.get("/")
@@ -28,5 +71,14 @@ def root():
     return {"message": "Добро пожаловать в сервис управления финансами!"}
 
 @app.on_event("startup")
-def on_startup():
-    init_db()
\ No newline at end of file
+async def on_startup():
+    init_db()
+    # Лимитер anyio доступен только из event loop — отсюда и ограничиваем пул хэширования
+    hashing_pool.limit_to_threadpool(anyio.to_thread.current_default_thread_limiter().total_tokens)
+    hashing_pool.start()
+    budget_events.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await budget_events.stop()
+    hashing_pool.shutdown()
@@ -1,11 +1,12 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from sqlmodel import SQLModel, Field, Relationship
-from datetime import datetime
+from sqlalchemy import Index, Column, BigInteger, JSON
+from datetime import datetime, date
 
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    username: str
-    email: str
+    username: str = Field(index=True, unique=True)
+    email: str = Field(index=True, unique=True)
     hashed_password: str  
 
     transactions: List["Transaction"] = Relationship(back_populates="user")
@@ -24,12 +25,21 @@ class Category(SQLModel, table=True):
 
 
 class Transaction(SQLModel, table=True):
+    # Индексы под keyset-пагинацию: ORDER BY created_at DESC, id DESC.
+    # (user_id, created_at, id) заодно обслуживает поиск по user_id.
+    __table_args__ = (
+        Index("ix_transaction_created_at_id", "created_at", "id"),
+        Index("ix_transaction_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
-    category_id: int = Field(foreign_key="category.id")
-    account_id: Optional[int] = Field(default=None, foreign_key="account.id")
+    category_id: int = Field(foreign_key="category.id", index=True)
+    account_id: Optional[int] = Field(default=None, foreign_key="account.id", index=True)
 
-    amount: float
+    # Суммы хранятся в минорных единицах (копейках), см. app/core/money.py
+    amount: int = Field(sa_column=Column(BigInteger, nullable=False))
+    currency: str = Field(default="RUB", max_length=3)
     description: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -40,9 +50,11 @@ class Transaction(SQLModel, table=True):
 
 class Budget(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id")
-    category_id: int = Field(foreign_key="category.id")
-    limit_amount: float
+    user_id: int = Field(foreign_key="user.id", index=True)
+    category_id: int = Field(foreign_key="category.id", index=True)
+    limit_amount: int = Field(sa_column=Column(BigInteger, nullable=False))
+    # Лимит и траты сравниваются только в одной валюте
+    currency: str = Field(default="RUB", max_length=3)
 
     user: Optional[User] = Relationship(back_populates="budgets")
     category: Optional[Category] = Relationship(back_populates="budgets")
@@ -50,9 +62,12 @@ class Budget(SQLModel, table=True):
 
 class Account(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     name: str
-    balance: float = 0.0
+    balance: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, default=0))
+    # Баланс на момент открытия (или ручной правки): balance = opening_balance + сумма транзакций
+    opening_balance: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, default=0, server_default="0"))
+    currency: str = Field(default="RUB", max_length=3)
 
     user: Optional[User] = Relationship(back_populates="accounts")
     transactions: List[Transaction] = Relationship(back_populates="account")
@@ -60,18 +75,47 @@ class Account(SQLModel, table=True):
 
 class Goal(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     title: str
-    target_amount: float
+    target_amount: int = Field(sa_column=Column(BigInteger, nullable=False))
     deadline: Optional[datetime] = None
-    current_amount: float = 0.0
+    current_amount: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, default=0))
 
     user: Optional[User] = Relationship(back_populates="goals")
     
 class UserCategoryPreference(SQLModel, table=True):
     user_id: int = Field(foreign_key="user.id", primary_key=True)
-    category_id: int = Field(foreign_key="category.id", primary_key=True)
+    category_id: int = Field(foreign_key="category.id", primary_key=True, index=True)
     notification_enabled: bool = Field(default=True)
 
     user: Optional[User] = Relationship(back_populates="category_preferences")
     category: Optional[Category] = Relationship(back_populates="user_preferences")
+
+
+class CategorySpending(SQLModel, table=True):
+    """
+    Агрегат трат пользователя по категории за месяц (period — первое число месяца)
+    в одной валюте: минорные единицы разных валют не складываются.
+    Обновляется в той же транзакции БД, что и сами транзакции.
+    """
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    category_id: int = Field(foreign_key="category.id", primary_key=True, index=True)
+    period: date = Field(primary_key=True)
+    currency: str = Field(default="RUB", primary_key=True, max_length=3)
+    total: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, default=0))
+    count: int = 0
+
+
+class MonthlySummarySnapshot(SQLModel, table=True):
+    """
+    Снапшот месячного отчёта пользователя за закрытые месяцы, отдельно по каждой валюте.
+    Заполняется фоновой задачей, сама таблица используется только при PR1_REPORT_SNAPSHOTS.
+    """
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    period: date = Field(primary_key=True)
+    currency: str = Field(default="RUB", primary_key=True, max_length=3)
+    income: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, default=0))
+    expenses: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, default=0))
+    net: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, default=0))
+    top_categories: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    refreshed_at: datetime = Field(default_factory=datetime.utcnow)
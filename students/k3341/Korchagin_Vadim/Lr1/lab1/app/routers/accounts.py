@@ -3,9 +3,12 @@ from sqlmodel import select, Session
 from typing import List
 from sqlalchemy.orm import selectinload
 
-from app.db.connection import get_session
-from app.models.finance_models import Account, User
-from app.schemas.finance_schemas import CreateAccount, ReadAccount, ReadAccountWithTransactions
+from app.db.connection import get_session, get_read_session
+from app.schemas.serializers import serialize_account, list_response
+from app.core.money import to_minor
+from app.db.balances import set_balance
+from app.models.finance_models import Account, Transaction, User
+from app.schemas.finance_schemas import CreateAccount, UpdateAccount, ReadAccount, ReadAccountWithTransactions
 
 router = APIRouter(prefix="/accounts", tags=["Accounts"])
 
@@ -15,10 +18,13 @@ def create_account(account_data: CreateAccount, session: Session = Depends(get_s
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    balance = to_minor(account_data.balance)
     account = Account(
         user_id=account_data.user_id,
         name=account_data.name,
-        balance=account_data.balance
+        balance=balance,
+        opening_balance=balance,
+        currency=account_data.currency
     )
     session.add(account)
     session.commit()
@@ -26,11 +32,11 @@ def create_account(account_data: CreateAccount, session: Session = Depends(get_s
     return account
 
 @router.get("/", response_model=List[ReadAccount])
-def get_all_accounts(session: Session = Depends(get_session)):
-    return session.exec(select(Account)).all()
+def get_all_accounts(session: Session = Depends(get_read_session)):
+    return list_response(serialize_account, session.exec(select(Account)).all())
 
 @router.get("/{account_id}", response_model=ReadAccountWithTransactions)
-def get_account(account_id: int, session: Session = Depends(get_session)):
+def get_account(account_id: int, session: Session = Depends(get_read_session)):
     stmt = (
         select(Account)
         .where(Account.id == account_id)
@@ -42,7 +48,12 @@ def get_account(account_id: int, session: Session = Depends(get_session)):
     return db_acc
 
 @router.patch("/{account_id}", response_model=ReadAccount)
-def update_account(account_id: int, acc_data: CreateAccount, session: Session = Depends(get_session)):
+def update_account(account_id: int, acc_data: UpdateAccount, session: Session = Depends(get_session)):
+    """
+    Валюта меняется только у счёта без транзакций, иначе их суммы потеряют смысл.
+    Баланс из запроса считается верным: текущее расхождение с транзакциями
+    уходит в opening_balance (см. set_balance), и сверка этот счёт больше не покажет.
+    """
     db_acc = session.get(Account, account_id)
     if not db_acc:
         raise HTTPException(status_code=404, detail="Account not found")
@@ -51,11 +62,21 @@ def update_account(account_id: int, acc_data: CreateAccount, session: Session =
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    if acc_data.currency is not None and acc_data.currency != db_acc.currency:
+        has_transactions = session.exec(
+            select(Transaction.id).where(Transaction.account_id == account_id).limit(1)
+        ).first()
+        if has_transactions is not None:
+            raise HTTPException(status_code=409, detail="Account with transactions cannot change currency")
+        db_acc.currency = acc_data.currency
+
     db_acc.user_id = acc_data.user_id
     db_acc.name = acc_data.name
-    db_acc.balance = acc_data.balance
 
     session.add(db_acc)
+    session.flush()
+    # Баланс — отдельным UPDATE, вместе с начальным балансом для сверки
+    set_balance(session, account_id, to_minor(acc_data.balance))
     session.commit()
     session.refresh(db_acc)
     return db_acc
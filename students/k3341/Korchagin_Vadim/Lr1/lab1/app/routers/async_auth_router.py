@@ -0,0 +1,121 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from typing import List
+
+from app.db.connection import get_async_session
+from app.schemas.serializers import serialize_user, list_response
+from app.models.finance_models import User
+from app.schemas.finance_schemas import (
+    UserRegister, UserLogin, UserOut
+)
+from app.core.auth import (
+    hash_password_async, verify_password_async, password_needs_rehash,
+    rehash_password, create_access_token, get_current_user_async
+)
+from app.core.user_cache import invalidate_user
+from app.db.references import is_unique_violation
+
+# Асинхронная версия auth-роутера (PR1_DB_MODE=async): тот же API,
+# но ни чтение пользователя, ни ожидание bcrypt не занимают поток threadpool
+router = APIRouter(prefix="/auth", tags=["Auth"])
+
+@router.post("/register", response_model=UserOut)
+async def register_user(user_data: UserRegister, session: AsyncSession = Depends(get_async_session)):
+    stmt = select(User).where(
+        (User.username == user_data.username) | (User.email == user_data.email)
+    )
+    existing_user = (await session.exec(stmt)).first()
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username or Email already in use"
+        )
+
+    new_user = User(
+        username=user_data.username,
+        email=user_data.email,
+        hashed_password=await hash_password_async(user_data.password),
+    )
+    session.add(new_user)
+    try:
+        await session.commit()
+    except IntegrityError as exc:
+        # Параллельная регистрация успела занять логин или почту — ловим по уникальному индексу
+        await session.rollback()
+        if not is_unique_violation(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username or Email already in use"
+        )
+    await session.refresh(new_user)
+    return new_user
+
+@router.post("/login")
+async def login_user(
+    login_data: UserLogin,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session)
+):
+    stmt = select(User).where(
+        (User.username == login_data.username_or_email)
+        | (User.email == login_data.username_or_email)
+    )
+    user = (await session.exec(stmt)).first()
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    # Хэш со старой стоимостью или схемой пересчитываем уже после ответа
+    if password_needs_rehash(user.hashed_password):
+        background_tasks.add_task(
+            rehash_password, user.id, login_data.password, user.hashed_password
+        )
+
+    token = create_access_token(user.id)
+    return {"access_token": token, "token_type": "bearer"}
+
+@router.get("/me", response_model=UserOut)
+async def get_me(current_user: User = Depends(get_current_user_async)):
+    return current_user
+
+@router.get("/users", response_model=List[UserOut])
+async def get_all_users(
+    current_user: User = Depends(get_current_user_async),
+    session: AsyncSession = Depends(get_async_session)
+):
+    users = (await session.exec(select(User))).all()
+    return list_response(serialize_user, users)
+
+@router.patch("/change-password")
+async def change_password(
+    old_password: str,
+    new_password: str,
+    current_user: User = Depends(get_current_user_async),
+    session: AsyncSession = Depends(get_async_session)
+):
+    # current_user может прийти из кэша, поэтому работаем с копией из сессии
+    db_user = await session.get(User, current_user.id)
+    if not db_user:
+        # Пользователя удалили, а кэш ещё помнит его — ведём себя как get_current_user
+        invalidate_user(current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    if not await verify_password_async(old_password, db_user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Old password is incorrect"
+        )
+
+    db_user.hashed_password = await hash_password_async(new_password)
+    session.add(db_user)
+    await session.commit()
+    invalidate_user(db_user.id)
+
+    return {"message": "Password changed successfully"}
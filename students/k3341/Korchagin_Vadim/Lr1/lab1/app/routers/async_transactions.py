@@ -0,0 +1,119 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional, List
+from datetime import datetime
+
+from app.db.connection import get_async_session, get_async_read_session
+from app.db.query_metrics import query_budget
+from app.db.transactions import (
+    MAX_BULK_ITEMS, add_transaction, change_transaction, remove_transaction, ingest_transactions,
+    publish_bulk_events, transactions_page, transactions_page_statement, transaction_detail_statement
+)
+from app.core.notifications import publish_transaction_event
+from app.models.finance_models import Transaction
+from app.schemas.finance_schemas import (
+    CreateTransaction, ReadTransaction, ReadTransactionFull, TransactionPage, BulkTransactionResult
+)
+
+# Асинхронная версия роутера транзакций (PR1_DB_MODE=async):
+# тот же API, но запросы идут через AsyncSession и не занимают threadpool.
+# Логика записи общая с sync-роутером и выполняется через run_sync.
+router = APIRouter(prefix="/transactions", tags=["Transactions"])
+
+
+@router.post("/", response_model=ReadTransaction)
+@query_budget(5)
+async def create_transaction(
+    trans: CreateTransaction,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session)
+):
+    new_trans = await session.run_sync(add_transaction, trans)
+    await session.commit()
+    await session.refresh(new_trans)
+
+    background_tasks.add_task(publish_transaction_event, new_trans.user_id, new_trans.category_id)
+    return new_trans
+
+
+@router.post("/bulk", response_model=BulkTransactionResult)
+async def create_transactions_bulk(
+    items: List[CreateTransaction],
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session)
+):
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Too many items, max {MAX_BULK_ITEMS}")
+    result = await session.run_sync(ingest_transactions, items)
+    publish_bulk_events(background_tasks, items, result)
+    return result
+
+
+@router.get("/", response_model=TransactionPage)
+@query_budget(1)
+async def get_all_transactions(
+    user_id: Optional[int] = None,
+    account_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    stmt = transactions_page_statement(user_id, account_id, category_id, date_from, date_to, cursor, limit)
+    return ORJSONResponse(transactions_page((await session.exec(stmt)).all(), limit))
+
+
+@router.get("/{transaction_id}", response_model=ReadTransactionFull)
+@query_budget(4)
+async def get_transaction(transaction_id: int, session: AsyncSession = Depends(get_async_read_session)):
+    db_trans = (await session.exec(transaction_detail_statement(transaction_id))).first()
+    if not db_trans:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return db_trans
+
+
+@router.patch("/{transaction_id}", response_model=ReadTransaction)
+# +1 запрос, если месяц закрыт и нужно сбросить его снапшот
+@query_budget(9)
+async def update_transaction(
+    transaction_id: int,
+    data: CreateTransaction,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session)
+):
+    db_trans = await session.get(Transaction, transaction_id)
+    if not db_trans:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+
+    # Траты старой пары (user, category) тоже могли вернуться в лимит
+    old_pair = (db_trans.user_id, db_trans.category_id)
+    await session.run_sync(change_transaction, db_trans, data)
+    await session.commit()
+    await session.refresh(db_trans)
+
+    background_tasks.add_task(publish_transaction_event, db_trans.user_id, db_trans.category_id)
+    if old_pair != (db_trans.user_id, db_trans.category_id):
+        background_tasks.add_task(publish_transaction_event, *old_pair)
+    return db_trans
+
+
+@router.delete("/{transaction_id}")
+# +1 запрос, если месяц закрыт и нужно сбросить его снапшот
+@query_budget(5)
+async def delete_transaction(
+    transaction_id: int,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session)
+):
+    db_trans = await session.get(Transaction, transaction_id)
+    if not db_trans:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+
+    # После удаления траты могли вернуться в лимит бюджета
+    background_tasks.add_task(publish_transaction_event, db_trans.user_id, db_trans.category_id)
+    await session.run_sync(remove_transaction, db_trans)
+    await session.commit()
+    return {"ok": True}
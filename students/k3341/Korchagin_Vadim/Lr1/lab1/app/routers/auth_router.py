@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlmodel import Session, select
+from sqlalchemy.exc import IntegrityError
 from typing import List
 
 from app.db.connection import get_session
+from app.schemas.serializers import serialize_user, list_response
 from app.models.finance_models import User
 from app.schemas.finance_schemas import (
     UserRegister, UserLogin, UserOut
 )
 from app.core.auth import (
-    hash_password, verify_password,
-    create_access_token, get_current_user
+    hash_password, verify_password, password_needs_rehash,
+    rehash_password, create_access_token, get_current_user
 )
+from app.core.user_cache import invalidate_user
+from app.db.references import is_unique_violation
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -32,12 +36,26 @@ def register_user(user_data: UserRegister, session: Session = Depends(get_sessio
         hashed_password=hash_password(user_data.password),
     )
     session.add(new_user)
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError as exc:
+        # Параллельная регистрация успела занять логин или почту — ловим по уникальному индексу
+        session.rollback()
+        if not is_unique_violation(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username or Email already in use"
+        )
     session.refresh(new_user)
     return new_user
 
 @router.post("/login")
-def login_user(login_data: UserLogin, session: Session = Depends(get_session)):
+def login_user(
+    login_data: UserLogin,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session)
+):
     stmt = select(User).where(
         (User.username == login_data.username_or_email)
         | (User.email == login_data.username_or_email)
@@ -49,6 +67,12 @@ def login_user(login_data: UserLogin, session: Session = Depends(get_session)):
             detail="Invalid credentials"
         )
 
+    # Хэш со старой стоимостью или схемой пересчитываем уже после ответа
+    if password_needs_rehash(user.hashed_password):
+        background_tasks.add_task(
+            rehash_password, user.id, login_data.password, user.hashed_password
+        )
+
     token = create_access_token(user.id)
     return {"access_token": token, "token_type": "bearer"}
 
@@ -62,7 +86,7 @@ def get_all_users(
     session: Session = Depends(get_session)
 ):
     users = session.exec(select(User)).all()
-    return users
+    return list_response(serialize_user, users)
 
 @router.patch("/change-password")
 def change_password(
@@ -71,15 +95,24 @@ def change_password(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    if not verify_password(old_password, current_user.hashed_password):
+    # current_user может прийти из кэша, поэтому работаем с копией из сессии
+    db_user = session.get(User, current_user.id)
+    if not db_user:
+        # Пользователя удалили, а кэш ещё помнит его — ведём себя как get_current_user
+        invalidate_user(current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    if not verify_password(old_password, db_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Old password is incorrect"
         )
 
-    current_user.hashed_password = hash_password(new_password)
-    session.add(current_user)
+    db_user.hashed_password = hash_password(new_password)
+    session.add(db_user)
     session.commit()
-    session.refresh(current_user)
+    invalidate_user(db_user.id)
 
     return {"message": "Password changed successfully"}
@@ -1,39 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlmodel import select, Session
-from typing import List
+from typing import List, Optional
+from datetime import date, datetime
 
-from app.db.connection import get_session
-from app.models.finance_models import Budget, User, Category
-from app.schemas.finance_schemas import CreateBudget, ReadBudget, ReadBudgetFull
+from app.db.connection import get_session, get_read_session
+from app.db.query_metrics import query_budget
+from app.schemas.serializers import serialize_budget
+from app.core.http_cache import cached_list_response, bump_table_version
+from app.core.money import to_minor
+from app.db.spending import spent_in_period
+from app.db.references import ensure_references
+from app.models.finance_models import Budget
+from app.schemas.finance_schemas import CreateBudget, ReadBudget, ReadBudgetFull, ReadBudgetUsage
 from sqlalchemy.orm import selectinload
 
 router = APIRouter(prefix="/budgets", tags=["Budgets"])
 
 @router.post("/", response_model=ReadBudget)
+@query_budget(3)
 def create_budget(data: CreateBudget, session: Session = Depends(get_session)):
-    user = session.get(User, data.user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    cat = session.get(Category, data.category_id)
-    if not cat:
-        raise HTTPException(status_code=404, detail="Category not found")
+    ensure_references(session, user=data.user_id, category=data.category_id)
 
     new_budget = Budget(
         user_id=data.user_id,
         category_id=data.category_id,
-        limit_amount=data.limit_amount
+        limit_amount=to_minor(data.limit_amount),
+        currency=data.currency
     )
     session.add(new_budget)
     session.commit()
     session.refresh(new_budget)
+    bump_table_version("budgets")
     return new_budget
 
 @router.get("/", response_model=List[ReadBudget])
-def get_all_budgets(session: Session = Depends(get_session)):
-    return session.exec(select(Budget)).all()
+def get_all_budgets(request: Request, session: Session = Depends(get_session)):
+    return cached_list_response(
+        request, "budgets",
+        lambda: serialize_budget.many(session.exec(select(Budget)).all())
+    )
 
 @router.get("/{budget_id}", response_model=ReadBudgetFull)
-def get_budget(budget_id: int, session: Session = Depends(get_session)):
+def get_budget(budget_id: int, session: Session = Depends(get_read_session)):
     stmt = (
         select(Budget)
         .where(Budget.id == budget_id)
@@ -47,25 +55,53 @@ def get_budget(budget_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=404, detail="Budget not found")
     return db_budget
 
+@router.get("/{budget_id}/usage", response_model=ReadBudgetUsage)
+@query_budget(2)
+def get_budget_usage(
+    budget_id: int,
+    period: Optional[date] = None,
+    session: Session = Depends(get_read_session)
+):
+    """
+    Сколько бюджета потрачено за месяц (по умолчанию — текущий) в валюте бюджета.
+    Читает только агрегат CategorySpending, сами транзакции не сканируются.
+    """
+    db_budget = session.get(Budget, budget_id)
+    if not db_budget:
+        raise HTTPException(status_code=404, detail="Budget not found")
+
+    period_start = (period or datetime.utcnow().date()).replace(day=1)
+    spent, count = spent_in_period(
+        session, db_budget.user_id, db_budget.category_id, period_start, db_budget.currency
+    )
+
+    return ReadBudgetUsage(
+        budget_id=db_budget.id,
+        period=period_start,
+        limit_amount=db_budget.limit_amount,
+        currency=db_budget.currency,
+        spent=spent,
+        transactions_count=count,
+        remaining=db_budget.limit_amount - spent
+    )
+
 @router.patch("/{budget_id}", response_model=ReadBudget)
+@query_budget(4)
 def update_budget(budget_id: int, data: CreateBudget, session: Session = Depends(get_session)):
     db_budget = session.get(Budget, budget_id)
     if not db_budget:
         raise HTTPException(status_code=404, detail="Budget not found")
 
-    user = session.get(User, data.user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    cat = session.get(Category, data.category_id)
-    if not cat:
-        raise HTTPException(status_code=404, detail="Category not found")
+    ensure_references(session, user=data.user_id, category=data.category_id)
 
     db_budget.user_id = data.user_id
     db_budget.category_id = data.category_id
-    db_budget.limit_amount = data.limit_amount
+    db_budget.limit_amount = to_minor(data.limit_amount)
+    db_budget.currency = data.currency
     session.add(db_budget)
     session.commit()
     session.refresh(db_budget)
+    bump_table_version("budgets")
     return db_budget
 
 @router.delete("/{budget_id}")
@@ -75,4 +111,5 @@ def delete_budget(budget_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=404, detail="Budget not found")
     session.delete(db_budget)
     session.commit()
+    bump_table_version("budgets")
     return {"ok": True}
\ No newline at end of file
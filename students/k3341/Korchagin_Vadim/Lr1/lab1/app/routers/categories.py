@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlmodel import select, Session
 from typing import List
 
-from app.db.connection import get_session
+from app.db.connection import get_session, get_read_session
+from app.schemas.serializers import serialize_category
+from app.core.http_cache import cached_list_response, bump_table_version
 from app.models.finance_models import Category
 from app.schemas.finance_schemas import CreateCategory, ReadCategory, ReadCategoryWithUsers
 from sqlalchemy.orm import selectinload
@@ -15,14 +17,18 @@ def create_category(cat: CreateCategory, session: Session = Depends(get_session)
     session.add(new_category)
     session.commit()
     session.refresh(new_category)
+    bump_table_version("categories")
     return new_category
 
 @router.get("/", response_model=List[ReadCategory])
-def get_all_categories(session: Session = Depends(get_session)):
-    return session.exec(select(Category)).all()
+def get_all_categories(request: Request, session: Session = Depends(get_session)):
+    return cached_list_response(
+        request, "categories",
+        lambda: serialize_category.many(session.exec(select(Category)).all())
+    )
 
 @router.get("/{category_id}", response_model=ReadCategoryWithUsers)
-def get_category(category_id: int, session: Session = Depends(get_session)):
+def get_category(category_id: int, session: Session = Depends(get_read_session)):
     stmt = (
         select(Category)
         .where(Category.id == category_id)
@@ -42,6 +48,7 @@ def update_category(category_id: int, data: CreateCategory, session: Session = D
     session.add(db_cat)
     session.commit()
     session.refresh(db_cat)
+    bump_table_version("categories")
     return db_cat
 
 @router.delete("/{category_id}")
@@ -51,4 +58,5 @@ def delete_category(category_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=404, detail="Category not found")
     session.delete(db_cat)
     session.commit()
+    bump_table_version("categories")
     return {"ok": True}
\ No newline at end of file
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import select, Session
+
+from app.db.connection import engine
+from app.core.money import from_minor
+from app.models.finance_models import Transaction
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = ["id", "user_id", "category_id", "account_id", "amount", "currency", "description", "created_at"]
+AMOUNT_INDEX = EXPORT_COLUMNS.index("amount")
+
+
+def iter_transaction_batches(user_id: int):
+    """
+    Читаем историю пользователя серверным курсором пачками по EXPORT_BATCH_SIZE,
+    поэтому в памяти одновременно лежит только одна пачка строк.
+    Сессия открывается внутри генератора и живёт, пока клиент читает ответ.
+    """
+    stmt = (
+        select(*[getattr(Transaction, name) for name in EXPORT_COLUMNS])
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.created_at, Transaction.id)
+        .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+    )
+    with Session(engine) as session:
+        result = session.execute(stmt)
+        for batch in result.partitions():
+            yield batch
+
+
+def export_row(row) -> list:
+    # Сумма хранится в копейках, наружу отдаём десятичной строкой
+    values = list(row)
+    values[AMOUNT_INDEX] = str(from_minor(values[AMOUNT_INDEX]))
+    return values
+
+
+def iter_ndjson(user_id: int):
+    for batch in iter_transaction_batches(user_id):
+        lines = []
+        for row in batch:
+            item = dict(zip(EXPORT_COLUMNS, export_row(row)))
+            item["created_at"] = item["created_at"].isoformat()
+            lines.append(json.dumps(item, ensure_ascii=False))
+        yield "\n".join(lines) + "\n"
+
+
+def iter_csv(user_id: int):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in iter_transaction_batches(user_id):
+        writer.writerows(export_row(row) for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Заголовок для пустой истории
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/transactions")
+def export_transactions(
+    user_id: int,
+    format: str = Query("ndjson", regex="^(ndjson|csv)$")
+):
+    """
+    Потоковая выгрузка всех транзакций пользователя в NDJSON или CSV.
+    """
+    if format == "csv":
+        return StreamingResponse(
+            iter_csv(user_id),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="transactions_{user_id}.csv"'}
+        )
+    return StreamingResponse(iter_ndjson(user_id), media_type="application/x-ndjson")
@@ -3,7 +3,9 @@ from sqlmodel import select, Session
 from typing import List
 from datetime import datetime
 
-from app.db.connection import get_session
+from app.db.connection import get_session, get_read_session
+from app.schemas.serializers import serialize_goal, list_response
+from app.core.money import to_minor
 from app.models.finance_models import Goal, User
 from app.schemas.finance_schemas import CreateGoal, ReadGoal, ReadGoalWithUser
 from sqlalchemy.orm import selectinload
@@ -19,9 +21,9 @@ def create_goal(goal_data: CreateGoal, session: Session = Depends(get_session)):
     goal = Goal(
         user_id=goal_data.user_id,
         title=goal_data.title,
-        target_amount=goal_data.target_amount,
+        target_amount=to_minor(goal_data.target_amount),
         deadline=goal_data.deadline,
-        current_amount=goal_data.current_amount
+        current_amount=to_minor(goal_data.current_amount)
     )
     session.add(goal)
     session.commit()
@@ -29,11 +31,11 @@ def create_goal(goal_data: CreateGoal, session: Session = Depends(get_session)):
     return goal
 
 @router.get("/", response_model=List[ReadGoal])
-def get_all_goals(session: Session = Depends(get_session)):
-    return session.exec(select(Goal)).all()
+def get_all_goals(session: Session = Depends(get_read_session)):
+    return list_response(serialize_goal, session.exec(select(Goal)).all())
 
 @router.get("/{goal_id}", response_model=ReadGoalWithUser)
-def get_goal(goal_id: int, session: Session = Depends(get_session)):
+def get_goal(goal_id: int, session: Session = Depends(get_read_session)):
     stmt = (
         select(Goal)
         .where(Goal.id == goal_id)
@@ -56,9 +58,9 @@ def update_goal(goal_id: int, data: CreateGoal, session: Session = Depends(get_s
 
     db_goal.user_id = data.user_id
     db_goal.title = data.title
-    db_goal.target_amount = data.target_amount
+    db_goal.target_amount = to_minor(data.target_amount)
     db_goal.deadline = data.deadline
-    db_goal.current_amount = data.current_amount
+    db_goal.current_amount = to_minor(data.current_amount)
 
     session.add(db_goal)
     session.commit()
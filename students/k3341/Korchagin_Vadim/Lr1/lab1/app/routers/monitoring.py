@@ -0,0 +1,66 @@
+import anyio.to_thread
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.db.connection import engine, async_engine, replica_engines, async_replica_engines
+from app.db.pool_metrics import pool_stats
+from app.db.query_metrics import route_query_metrics
+from app.core import metrics
+from app.core.hashing import hashing_pool
+
+router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
+# /metrics — по привычному для Prometheus адресу, без префикса
+metrics_router = APIRouter(tags=["Monitoring"])
+
+@router.get("/db-pool")
+def get_db_pool_stats():
+    """
+    Состояние пулов соединений: занятые соединения, overflow и время ожидания.
+    """
+    result = {"sync": pool_stats(engine.pool)}
+    if async_engine is not None:
+        result["async"] = pool_stats(async_engine.sync_engine.pool)
+    for index, replica in enumerate(replica_engines):
+        result[f"replica-{index}"] = pool_stats(replica.pool)
+    for index, replica in enumerate(async_replica_engines):
+        result[f"async-replica-{index}"] = pool_stats(replica.sync_engine.pool)
+    return result
+
+
+@router.get("/queries")
+def get_query_stats():
+    """
+    Запросы к БД по маршрутам: среднее и максимум на запрос, время в БД, превышения бюджета.
+    """
+    return route_query_metrics.snapshot()
+
+
+def collect_pool_metrics(engine_label: str, pool) -> None:
+    stats = pool_stats(pool)
+    for state in ("size", "checked_in", "checked_out", "overflow"):
+        if state in stats:
+            metrics.db_pool_connections.set(stats[state], engine_label, state)
+    if "checkouts" in stats:
+        metrics.db_pool_checkouts_total.set(stats["checkouts"], engine_label)
+        metrics.db_pool_timeouts_total.set(stats["timeouts"], engine_label)
+        metrics.db_pool_wait_seconds_total.set(stats["wait_ms_total"] / 1000, engine_label)
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """
+    Метрики в формате Prometheus. Состояние пулов снимается в момент запроса.
+    """
+    # Лимитер anyio — это и есть threadpool, в котором крутятся sync-эндпоинты
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    metrics.threadpool_tokens.set(limiter.borrowed_tokens, "borrowed")
+    metrics.threadpool_tokens.set(limiter.total_tokens, "total")
+    metrics.hash_in_flight.set(hashing_pool.in_flight())
+    collect_pool_metrics("sync", engine.pool)
+    if async_engine is not None:
+        collect_pool_metrics("async", async_engine.sync_engine.pool)
+    for index, replica in enumerate(replica_engines):
+        collect_pool_metrics(f"replica-{index}", replica.pool)
+    for index, replica in enumerate(async_replica_engines):
+        collect_pool_metrics(f"async-replica-{index}", replica.sync_engine.pool)
+    return PlainTextResponse(metrics.render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,32 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlmodel import Session, select
 from typing import List
 
-from app.db.connection import get_session
-from app.models.finance_models import UserCategoryPreference, User, Category
+from app.db.connection import get_session, get_read_session
+from app.db.query_metrics import query_budget
+from app.db.references import ensure_references
+from app.schemas.serializers import serialize_preference
+from app.core.http_cache import cached_list_response, bump_table_version
+from app.models.finance_models import UserCategoryPreference
 from app.schemas.finance_schemas import CreateUserCategoryPreference, ReadUserCategoryPreference
 
 router = APIRouter(prefix="/preferences", tags=["Preferences"])
 
 @router.post("/", response_model=ReadUserCategoryPreference)
+@query_budget(3)
 def create_pref(data: CreateUserCategoryPreference, session: Session = Depends(get_session)):
-    user = session.get(User, data.user_id)
-    cat = session.get(Category, data.category_id)
-    if not user or not cat:
-        raise HTTPException(status_code=404, detail="User or category not found")
+    ensure_references(session, detail="User or category not found", user=data.user_id, category=data.category_id)
 
     pref = UserCategoryPreference(**data.dict())
     session.add(pref)
     session.commit()
     session.refresh(pref)
+    bump_table_version("preferences")
     return pref
 
 @router.get("/", response_model=List[ReadUserCategoryPreference])
-def get_all(session: Session = Depends(get_session)):
-    return session.exec(select(UserCategoryPreference)).all()
+def get_all(request: Request, session: Session = Depends(get_session)):
+    return cached_list_response(
+        request, "preferences",
+        lambda: serialize_preference.many(session.exec(select(UserCategoryPreference)).all())
+    )
 
 @router.get("/{user_id}/{category_id}", response_model=ReadUserCategoryPreference)
-def get_one(user_id: int, category_id: int, session: Session = Depends(get_session)):
+def get_one(user_id: int, category_id: int, session: Session = Depends(get_read_session)):
     pref = session.get(UserCategoryPreference, (user_id, category_id))
     if not pref:
         raise HTTPException(status_code=404, detail="Not found")
@@ -39,4 +45,5 @@ def delete_pref(user_id: int, category_id: int, session: Session = Depends(get_s
         raise HTTPException(status_code=404, detail="Not found")
     session.delete(pref)
     session.commit()
+    bump_table_version("preferences")
     return {"ok": True}
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+from datetime import datetime
+
+from app.core import config
+from app.core.money import DEFAULT_CURRENCY
+from app.db.connection import get_read_session
+from app.db.reports import add_months, compute_summaries, snapshot_summaries, SNAPSHOT_TOP_N
+from app.models.finance_models import User
+from app.schemas.finance_schemas import ReadSummaryReport
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+@router.get("/summary", response_model=ReadSummaryReport)
+def get_summary(
+    user_id: int,
+    months: int = Query(12, ge=1, le=120),
+    top_n: int = Query(3, ge=1, le=20),
+    currency: str = Query(DEFAULT_CURRENCY, regex="^[A-Z]{3}$"),
+    session: Session = Depends(get_read_session)
+):
+    """
+    Доходы, расходы, чистый поток и топ категорий расходов по месяцам
+    за последние `months` месяцев, включая текущий, в валюте `currency`.
+    При PR1_REPORT_SNAPSHOTS закрытые месяцы читаются из снапшота,
+    а вживую считаются только месяцы, которых в снапшоте нет (в т.ч. текущий).
+    """
+    if not session.get(User, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    current_month = datetime.utcnow().date().replace(day=1)
+    date_from = add_months(current_month, -(months - 1))
+    date_to = add_months(current_month, 1)
+
+    summaries = []
+    live_ranges = [(date_from, date_to)]
+    # В снапшоте хранится SNAPSHOT_TOP_N категорий; если просят больше — считаем вживую
+    if config.REPORT_SNAPSHOTS_ENABLED and top_n <= SNAPSHOT_TOP_N:
+        summaries, live_ranges = snapshot_summaries(session, user_id, currency, date_from, date_to)
+
+    for live_from, live_to in live_ranges:
+        live = compute_summaries(
+            session, live_from, live_to, user_id=user_id, currency=currency, top_n=top_n
+        )
+        summaries += live.values()
+    summaries.sort(key=lambda summary: summary["period"])
+    for summary in summaries:
+        summary["top_categories"] = summary["top_categories"][:top_n]
+
+    return ReadSummaryReport(user_id=user_id, currency=currency, months=summaries)
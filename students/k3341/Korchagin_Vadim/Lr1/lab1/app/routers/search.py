@@ -0,0 +1,60 @@
+import base64
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+from typing import Optional
+
+from app.db.connection import get_read_session
+from app.db.query_metrics import query_budget
+from app.db.search import search_terms, search_transactions
+from app.models.finance_models import User
+from app.schemas.finance_schemas import TransactionSearchHit, TransactionSearchPage
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+# Порядок по релевантности не даёт устойчивого ключа для keyset, поэтому курсор — смещение
+def encode_offset(offset: int) -> str:
+    return base64.urlsafe_b64encode(str(offset).encode()).decode()
+
+
+def decode_offset(cursor: str) -> int:
+    try:
+        offset = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return offset
+
+
+@router.get("/transactions", response_model=TransactionSearchPage)
+@query_budget(2)
+def search_user_transactions(
+    user_id: int,
+    q: str = Query(..., min_length=1, max_length=200, description="Слова для поиска в описании"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    session: Session = Depends(get_read_session)
+):
+    """
+    Поиск по описаниям транзакций пользователя: все слова запроса должны встретиться,
+    сначала самые релевантные. Postgres — tsvector + GIN, SQLite — FTS5.
+    """
+    if not search_terms(q):
+        raise HTTPException(status_code=400, detail="Query has no searchable words")
+    if not session.get(User, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    offset = decode_offset(cursor) if cursor else 0
+    # Берём на одну строку больше, чтобы понять, есть ли следующая страница
+    rows = search_transactions(session, user_id, q, limit + 1, offset)
+    items = [
+        TransactionSearchHit(
+            id=trans.id, amount=trans.amount, currency=trans.currency, description=trans.description,
+            created_at=trans.created_at, account_id=trans.account_id, category_id=trans.category_id,
+            rank=rank,
+        )
+        for trans, rank in rows[:limit]
+    ]
+    next_cursor = encode_offset(offset + limit) if len(rows) > limit else None
+    return TransactionSearchPage(items=items, next_cursor=next_cursor)
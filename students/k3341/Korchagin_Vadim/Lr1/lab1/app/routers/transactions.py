@@ -1,151 +1,137 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import select, Session
-from typing import List
-
-from app.db.connection import get_session
-from app.models.finance_models import Transaction, User, Category, Account
-from app.schemas.finance_schemas import CreateTransaction, ReadTransaction, ReadTransactionFull
-from sqlalchemy.orm import selectinload
-
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlmodel import Session
+from typing import Optional, List
+from datetime import datetime
+
+from app.db.connection import get_session, get_read_session
+from app.db.query_metrics import query_budget
+from app.db.transactions import (
+    MAX_BULK_ITEMS, add_transaction, change_transaction, remove_transaction, ingest_transactions,
+    publish_bulk_events, transactions_page, transactions_page_statement, transaction_detail_statement
+)
+from app.core.notifications import publish_transaction_event
+from app.models.finance_models import Transaction
+from app.schemas.finance_schemas import (
+    CreateTransaction, ReadTransaction, ReadTransactionFull, TransactionPage, BulkTransactionResult
+)
+
+# Проверки, баланс и агрегаты трат — в app/db/transactions.py, общие с async-роутером
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
 
 @router.post("/", response_model=ReadTransaction)
+@query_budget(5)
 def create_transaction(
-    trans: CreateTransaction, 
+    trans: CreateTransaction,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session)
 ):
     """
-    Создаём новую транзакцию и, если указан account_id, 
+    Создаём новую транзакцию и, если указан account_id,
     автоматически меняем баланс счёта (account.balance).
     """
-    user = session.get(User, trans.user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    cat = session.get(Category, trans.category_id)
-    if not cat:
-        raise HTTPException(status_code=404, detail="Category not found")
-
-    new_trans = Transaction(
-        user_id=trans.user_id,
-        category_id=trans.category_id,
-        account_id=trans.account_id,
-        amount=trans.amount,
-        description=trans.description
-    )
-
-    session.add(new_trans)
-
-    # Если транзакция привязана к счёту — меняем баланс
-    if trans.account_id is not None:
-        account = session.get(Account, trans.account_id)
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
-
-        account.balance += trans.amount
-        session.add(account)
-
+    new_trans = add_transaction(session, trans)
     session.commit()
     session.refresh(new_trans)
+
+    # Проверка бюджета — в фоновом воркере уже после ответа
+    background_tasks.add_task(publish_transaction_event, new_trans.user_id, new_trans.category_id)
     return new_trans
 
 
-@router.get("/", response_model=List[ReadTransaction])
-def get_all_transactions(session: Session = Depends(get_session)):
-    return session.exec(select(Transaction).order_by(Transaction.created_at.desc())).all()
+@router.post("/bulk", response_model=BulkTransactionResult)
+def create_transactions_bulk(
+    items: List[CreateTransaction],
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session)
+):
+    """
+    Импорт выписки одним запросом. Ошибочные строки не прерывают пакет,
+    а возвращаются в errors со своим индексом.
+    """
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Too many items, max {MAX_BULK_ITEMS}")
+    result = ingest_transactions(session, items)
+    publish_bulk_events(background_tasks, items, result)
+    return result
+
+
+@router.get("/", response_model=TransactionPage)
+@query_budget(1)
+def get_all_transactions(
+    user_id: Optional[int] = None,
+    account_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    session: Session = Depends(get_read_session)
+):
+    """
+    Keyset-пагинация по (created_at, id): страница N стоит столько же, сколько первая.
+    """
+    stmt = transactions_page_statement(user_id, account_id, category_id, date_from, date_to, cursor, limit)
+    return ORJSONResponse(transactions_page(session.exec(stmt).all(), limit))
 
 
 @router.get("/{transaction_id}", response_model=ReadTransactionFull)
-def get_transaction(transaction_id: int, session: Session = Depends(get_session)):
-    stmt = (
-        select(Transaction)
-        .where(Transaction.id == transaction_id)
-        .options(
-            selectinload(Transaction.user),
-            selectinload(Transaction.category),
-            selectinload(Transaction.account)
-        )
-    )
-    db_trans = session.exec(stmt).first()
+@query_budget(4)
+def get_transaction(transaction_id: int, session: Session = Depends(get_read_session)):
+    db_trans = session.exec(transaction_detail_statement(transaction_id)).first()
     if not db_trans:
         raise HTTPException(status_code=404, detail="Transaction not found")
     return db_trans
 
 
 @router.patch("/{transaction_id}", response_model=ReadTransaction)
+# +1 запрос, если месяц закрыт и нужно сбросить его снапшот
+@query_budget(9)
 def update_transaction(
-    transaction_id: int, 
-    data: CreateTransaction, 
+    transaction_id: int,
+    data: CreateTransaction,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session)
 ):
     """
-    Частично обновляем транзакцию.  
-    1) Возвращаем старую сумму в баланс старого счёта (если был).  
-    2) Привязываем к новому счёту и добавляем в его баланс новую сумму.  
+    Обновляем транзакцию: старая сумма уходит из баланса старого счёта,
+    новая добавляется в баланс нового.
     """
     db_trans = session.get(Transaction, transaction_id)
     if not db_trans:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
-    # Проверяем новые user / category / account
-    user = session.get(User, data.user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    cat = session.get(Category, data.category_id)
-    if not cat:
-        raise HTTPException(status_code=404, detail="Category not found")
-
-    old_account_id = db_trans.account_id
-    old_amount = db_trans.amount
-
-    # 1) Если раньше был счёт, "возвращаем" старую сумму 
-    #    (обнуляем то, что мы добавляли/убирали из этого счёта)
-    if old_account_id is not None:
-        old_acc = session.get(Account, old_account_id)
-        if old_acc:
-            old_acc.balance -= old_amount
-            session.add(old_acc)
-
-    # 2) Обновляем поля транзакции
-    db_trans.user_id = data.user_id
-    db_trans.category_id = data.category_id
-    db_trans.account_id = data.account_id
-    db_trans.amount = data.amount
-    db_trans.description = data.description
-
-    # 3) Если теперь указан новый счёт, добавляем новую сумму
-    if data.account_id is not None:
-        new_acc = session.get(Account, data.account_id)
-        if not new_acc:
-            raise HTTPException(status_code=404, detail="Account not found")
-        new_acc.balance += data.amount
-        session.add(new_acc)
-
-    session.add(db_trans)
+    # Траты старой пары (user, category) тоже могли вернуться в лимит
+    old_pair = (db_trans.user_id, db_trans.category_id)
+    change_transaction(session, db_trans, data)
     session.commit()
     session.refresh(db_trans)
+
+    background_tasks.add_task(publish_transaction_event, db_trans.user_id, db_trans.category_id)
+    if old_pair != (db_trans.user_id, db_trans.category_id):
+        background_tasks.add_task(publish_transaction_event, *old_pair)
     return db_trans
 
 
 @router.delete("/{transaction_id}")
-def delete_transaction(transaction_id: int, session: Session = Depends(get_session)):
+# +1 запрос, если месяц закрыт и нужно сбросить его снапшот
+@query_budget(5)
+def delete_transaction(
+    transaction_id: int,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session)
+):
     """
-    Удаляем транзакцию. Если она была привязана к счёту, 
+    Удаляем транзакцию. Если она была привязана к счёту,
     компенсируем (убираем) её из баланса этого счёта.
     """
     db_trans = session.get(Transaction, transaction_id)
     if not db_trans:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
-    # Возвращаем баланс счёта к состоянию до этой транзакции
-    if db_trans.account_id is not None:
-        account = db_trans.account
-        if account:
-            account.balance -= db_trans.amount
-            session.add(account)
-
-    session.delete(db_trans)
+    # После удаления траты могли вернуться в лимит бюджета
+    background_tasks.add_task(publish_transaction_event, db_trans.user_id, db_trans.category_id)
+    remove_transaction(session, db_trans)
     session.commit()
-    return {"ok": True}
\ No newline at end of file
+    return {"ok": True}
@@ -1,48 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import select
-from typing import List
+from typing import List, Optional, Set
 from sqlmodel import Session
-from sqlalchemy.orm import selectinload
+from sqlalchemy.exc import IntegrityError
 
-from app.db.connection import get_session
-from app.models.finance_models import User
+from app.db.connection import get_session, get_read_session
+from app.db.query_metrics import query_budget
+from app.schemas.serializers import serialize_user, list_response
+from app.core.auth import hash_password
+from app.core.user_cache import invalidate_user
+from app.db.references import is_unique_violation
+from app.models.finance_models import User, Transaction, Account, Budget, Goal, UserCategoryPreference
 from app.schemas.finance_schemas import UserRegister, UserOut, ReadUserWithRelations
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+USER_RELATIONS = ("accounts", "transactions", "budgets", "goals", "category_preferences")
+# Связь -> (модель, порядок); транзакции грузятся отдельно — новые первыми
+RELATION_QUERIES = {
+    "accounts": (Account, Account.id),
+    "budgets": (Budget, Budget.id),
+    "goals": (Goal, Goal.id),
+    "category_preferences": (UserCategoryPreference, UserCategoryPreference.category_id),
+}
+
+
+def parse_include(include: Optional[str]) -> Set[str]:
+    if include is None:
+        return set(USER_RELATIONS)
+    requested = {name.strip() for name in include.split(",") if name.strip()}
+    unknown = requested - set(USER_RELATIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown relations: {', '.join(sorted(unknown))}"
+        )
+    return requested
+
 @router.post("/", response_model=UserOut)
 def create_user(user: UserRegister, session: Session = Depends(get_session)):
     new_user = User(
         username=user.username,
-        email=user.email
+        email=user.email,
+        hashed_password=hash_password(user.password),
     )
     session.add(new_user)
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError as exc:
+        session.rollback()
+        if not is_unique_violation(exc):
+            raise
+        raise HTTPException(status_code=400, detail="Username or Email already in use")
     session.refresh(new_user)
     return new_user
 
 @router.get("/", response_model=List[UserOut])
-def get_all_users(session: Session = Depends(get_session)):
+def get_all_users(session: Session = Depends(get_read_session)):
     result = session.exec(select(User)).all()
-    return result
+    return list_response(serialize_user, result)
 
-@router.get("/{user_id}", response_model=ReadUserWithRelations)
-def get_user(user_id: int, session: Session = Depends(get_session)):
-    stmt = (
-        select(User)
-        .where(User.id == user_id)
-        .options(
-            selectinload(User.accounts),
-            selectinload(User.transactions),
-            selectinload(User.budgets),
-            selectinload(User.goals),
-            selectinload(User.category_preferences)
-        )
-    )
-    user = session.exec(stmt).first()
+@router.get("/{user_id}", response_model=ReadUserWithRelations, response_model_exclude_unset=True)
+@query_budget(1 + len(USER_RELATIONS))
+def get_user(
+    user_id: int,
+    include: Optional[str] = Query(None, description="Связи через запятую, например accounts,goals"),
+    transactions_limit: int = Query(50, ge=0, le=1000),
+    relations_limit: int = Query(50, ge=0, le=1000, description="Лимит для остальных связей"),
+    session: Session = Depends(get_read_session)
+):
+    """
+    Пользователь с выбранными связями. Незапрошенные связи не загружаются
+    и не попадают в ответ. Каждая связь — отдельный запрос с LIMIT:
+    транзакции — последние transactions_limit штук, остальные — первые relations_limit.
+    """
+    requested = parse_include(include)
+
+    user = session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+
+    data = {"id": user.id, "username": user.username, "email": user.email}
+    for name, (model, order) in RELATION_QUERIES.items():
+        if name in requested:
+            data[name] = session.exec(
+                select(model).where(model.user_id == user_id).order_by(order).limit(relations_limit)
+            ).all()
+
+    if "transactions" in requested:
+        data["transactions"] = session.exec(
+            select(Transaction)
+            .where(Transaction.user_id == user_id)
+            .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+            .limit(transactions_limit)
+        ).all()
+
+    return ReadUserWithRelations(**data)
 
 @router.patch("/{user_id}", response_model=UserOut)
 def update_user(user_id: int, user_data: UserRegister, session: Session = Depends(get_session)):
@@ -53,8 +106,15 @@ def update_user(user_id: int, user_data: UserRegister, session: Session = Depend
     db_user.email = user_data.email
 
     session.add(db_user)
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError as exc:
+        session.rollback()
+        if not is_unique_violation(exc):
+            raise
+        raise HTTPException(status_code=400, detail="Username or Email already in use")
     session.refresh(db_user)
+    invalidate_user(user_id)
     return db_user
 
 @router.delete("/{user_id}")
@@ -64,4 +124,5 @@ def delete_user(user_id: int, session: Session = Depends(get_session)):
         raise HTTPException(status_code=404, detail="User not found")
     session.delete(db_user)
     session.commit()
+    invalidate_user(user_id)
     return {"ok": True}
\ No newline at end of file
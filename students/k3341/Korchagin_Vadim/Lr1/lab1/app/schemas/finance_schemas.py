@@ -1,6 +1,39 @@
 from typing import Optional, List
-from datetime import datetime
-from pydantic import BaseModel
+from datetime import datetime, date
+from decimal import Decimal
+from pydantic import BaseModel, condecimal, constr
+
+from app.core.money import from_minor, DEFAULT_CURRENCY
+
+# Сумма во входных данных: десятичное число с точностью до копейки
+MoneyIn = condecimal(max_digits=18, decimal_places=2)
+Currency = constr(regex="^[A-Z]{3}$")
+
+
+class MinorUnits(Decimal):
+    """
+    Сумма в ответе. Из БД приходит целым числом минорных единиц (копеек)
+    и превращается в Decimal, уже готовый Decimal пропускается как есть.
+    """
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value):
+        if isinstance(value, Decimal):
+            return value
+        if isinstance(value, int):
+            return from_minor(value)
+        raise TypeError("amount in minor units must be int")
+
+
+class ReadModel(BaseModel):
+    # Decimal отдаём строкой ("12.50"), чтобы клиент не терял точность на float
+    class Config:
+        json_encoders = {Decimal: str}
+
 
 class UserRegister(BaseModel):
     username: str
@@ -11,7 +44,7 @@ class UserLogin(BaseModel):
     username_or_email: str
     password: str
 
-class UserOut(BaseModel):
+class UserOut(ReadModel):
     id: int
     username: str
     email: str
@@ -27,25 +60,32 @@ class CreateTransaction(BaseModel):
     user_id: int
     category_id: int
     account_id: Optional[int] = None
-    amount: float
+    amount: MoneyIn
+    currency: Currency = DEFAULT_CURRENCY
     description: Optional[str] = None
 
 class CreateBudget(BaseModel):
     user_id: int
     category_id: int
-    limit_amount: float
+    limit_amount: MoneyIn
+    currency: Currency = DEFAULT_CURRENCY
 
 class CreateAccount(BaseModel):
     user_id: int
     name: str
-    balance: float = 0.0
+    balance: MoneyIn = Decimal("0")
+    currency: Currency = DEFAULT_CURRENCY
+
+class UpdateAccount(CreateAccount):
+    # Без currency валюта счёта остаётся прежней
+    currency: Optional[Currency] = None
 
 class CreateGoal(BaseModel):
     user_id: int
     title: str
-    target_amount: float
+    target_amount: MoneyIn
     deadline: Optional[datetime] = None
-    current_amount: float = 0.0
+    current_amount: MoneyIn = Decimal("0")
 
 class CreateUserCategoryPreference(BaseModel):
     user_id: int
@@ -56,44 +96,47 @@ class CreateUserCategoryPreference(BaseModel):
 # ----------------------------------------------------------------
 # ----------------------------------------------------------------
 
-class ReadCategory(BaseModel):
+class ReadCategory(ReadModel):
     id: int
     name: str
     class Config:
         from_attributes = True
 
-class ReadTransaction(BaseModel):
+class ReadTransaction(ReadModel):
     id: int
-    amount: float
+    amount: MinorUnits
+    currency: str
     description: Optional[str]
     created_at: datetime
     account_id: Optional[int] = None
     class Config:
         from_attributes = True
 
-class ReadBudget(BaseModel):
+class ReadBudget(ReadModel):
     id: int
-    limit_amount: float
+    limit_amount: MinorUnits
+    currency: str
     class Config:
         from_attributes = True
 
-class ReadAccount(BaseModel):
+class ReadAccount(ReadModel):
     id: int
     name: str
-    balance: float
+    balance: MinorUnits
+    currency: str
     class Config:
         from_attributes = True
 
-class ReadGoal(BaseModel):
+class ReadGoal(ReadModel):
     id: int
     title: str
-    target_amount: float
-    current_amount: float
+    target_amount: MinorUnits
+    current_amount: MinorUnits
     deadline: Optional[datetime]
     class Config:
         from_attributes = True
 
-class ReadUserCategoryPreference(BaseModel):
+class ReadUserCategoryPreference(ReadModel):
     user_id: int
     category_id: int
     notification_enabled: bool
@@ -147,7 +190,48 @@ class ReadTransactionFull(ReadTransaction):
     class Config:
         from_attributes = True
 
+class TransactionPage(ReadModel):
+    items: List[ReadTransaction] = []
+    next_cursor: Optional[str] = None
 
+class TransactionSearchHit(ReadTransaction):
+    category_id: int
+    rank: float
+
+class TransactionSearchPage(ReadModel):
+    items: List[TransactionSearchHit] = []
+    next_cursor: Optional[str] = None
+
+class BulkTransactionError(BaseModel):
+    index: int
+    detail: str
+
+class BulkTransactionResult(BaseModel):
+    created: int
+    errors: List[BulkTransactionError] = []
+
+class ReadBudgetUsage(ReadModel):
+    budget_id: int
+    period: date
+    limit_amount: MinorUnits
+    currency: str
+    spent: MinorUnits
+    transactions_count: int
+    remaining: MinorUnits
+
+class ReadCategoryExpenses(ReadModel):
+    category_id: int
+    name: str
+    expenses: MinorUnits
 
+class ReadMonthlySummary(ReadModel):
+    period: date
+    income: MinorUnits
+    expenses: MinorUnits
+    net: MinorUnits
+    top_categories: List[ReadCategoryExpenses] = []
 
-
+class ReadSummaryReport(ReadModel):
+    user_id: int
+    currency: str
+    months: List[ReadMonthlySummary] = []
@@ -0,0 +1,53 @@
+from typing import Callable, Iterable, List, Optional
+
+from fastapi.responses import ORJSONResponse
+
+from app.core.money import from_minor
+from app.schemas import finance_schemas as schemas
+
+
+def _minor_to_str(value):
+    return None if value is None else str(from_minor(value))
+
+
+class RowSerializer:
+    """
+    Заранее собранный сериализатор плоской Read*-схемы: поля и конвертеры
+    вычисляются один раз, а ORM-объект превращается в dict без pydantic-валидации.
+    datetime/date оставляем как есть — их сериализует orjson.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.fields: List[tuple] = []
+        for name, field in schema.__fields__.items():
+            converter: Optional[Callable] = None
+            if field.type_ is schemas.MinorUnits:
+                converter = _minor_to_str
+            elif isinstance(field.type_, type) and issubclass(field.type_, schemas.BaseModel):
+                raise TypeError(f"{schema.__name__}.{name}: nested models are not supported")
+            self.fields.append((name, converter))
+
+    def __call__(self, obj) -> dict:
+        result = {}
+        for name, converter in self.fields:
+            value = getattr(obj, name)
+            result[name] = converter(value) if converter else value
+        return result
+
+    def many(self, objs: Iterable) -> list:
+        return [self(obj) for obj in objs]
+
+
+def list_response(serializer: RowSerializer, rows: Iterable) -> ORJSONResponse:
+    # Возвращаем Response напрямую: FastAPI не валидирует его повторно через response_model
+    return ORJSONResponse(serializer.many(rows))
+
+
+serialize_user = RowSerializer(schemas.UserOut)
+serialize_category = RowSerializer(schemas.ReadCategory)
+serialize_transaction = RowSerializer(schemas.ReadTransaction)
+serialize_budget = RowSerializer(schemas.ReadBudget)
+serialize_account = RowSerializer(schemas.ReadAccount)
+serialize_goal = RowSerializer(schemas.ReadGoal)
+serialize_preference = RowSerializer(schemas.ReadUserCategoryPreference)
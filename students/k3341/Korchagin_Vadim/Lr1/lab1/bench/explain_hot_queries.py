@@ -0,0 +1,112 @@
+"""
+Проверка планов горячих запросов: каждый должен идти по индексу,
+полный проход по таблице без индекса — ошибка (код возврата 1).
+
+    python -m bench.explain_hot_queries
+    python -m bench.explain_hot_queries --db postgresql://...
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, text
+from sqlmodel import SQLModel, create_engine, select
+
+from app.models.finance_models import (
+    Account, Budget, Category, Goal, Transaction, User, UserCategoryPreference,
+)
+
+
+def seed(engine, users: int, per_user: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": u, "username": f"user{u}", "email": f"user{u}@x", "hashed_password": "-"}
+            for u in range(1, users + 1)
+        ])
+        conn.execute(Category.__table__.insert(), [{"id": c, "name": f"category {c}"} for c in range(1, 11)])
+        conn.execute(Account.__table__.insert(), [
+            {"id": u, "user_id": u, "name": "main", "balance": 0, "currency": "RUB"} for u in range(1, users + 1)
+        ])
+        conn.execute(Transaction.__table__.insert(), [
+            {
+                "user_id": u, "category_id": i % 10 + 1, "account_id": u,
+                "amount": -100, "currency": "RUB", "created_at": start + timedelta(minutes=i),
+            }
+            for u in range(1, users + 1) for i in range(per_user)
+        ])
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+
+def hot_queries():
+    """Запросы из роутеров в том виде, в каком их строит приложение."""
+    return {
+        "login by username/email": select(User).where(or_(User.username == "user7", User.email == "user7")),
+        "transactions page": select(Transaction)
+        .where(Transaction.user_id == 7)
+        .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+        .limit(50),
+        "transactions by account": select(Transaction).where(Transaction.account_id == 7),
+        "transactions by category": select(Transaction).where(Transaction.category_id == 3),
+        "accounts by user": select(Account).where(Account.user_id == 7),
+        "budgets by user": select(Budget).where(Budget.user_id == 7),
+        "budgets by category": select(Budget).where(Budget.category_id == 3),
+        "goals by user": select(Goal).where(Goal.user_id == 7),
+        "preferences by category": select(UserCategoryPreference).where(UserCategoryPreference.category_id == 3),
+    }
+
+
+def explain(conn, stmt) -> list:
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    rows = conn.exec_driver_sql(prefix + str(compiled)).all()
+    # В SQLite текст плана — последняя колонка, в Postgres — единственная
+    return [row[-1] for row in rows]
+
+
+def uses_full_scan(dialect: str, plan: list) -> bool:
+    if dialect == "sqlite":
+        return any(line.startswith("SCAN ") and "USING" not in line for line in plan)
+    return any("Seq Scan" in line for line in plan)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=None, help="PR1_DB_URL; по умолчанию временная SQLite с данными")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--per-user", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.db:
+        engine = create_engine(args.db)
+    else:
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'explain.db')}")
+        seed(engine, args.users, args.per_user)
+
+    failed = []
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # На маленьких таблицах планировщик и так выберет seq scan; проверяем, что индекс вообще есть
+            conn.execute(text("SET enable_seqscan = off"))
+        for name, stmt in hot_queries().items():
+            plan = explain(conn, stmt)
+            bad = uses_full_scan(conn.dialect.name, plan)
+            print(f"{'FAIL' if bad else 'ok  '} {name}")
+            for line in plan:
+                print(f"       {line}")
+            if bad:
+                failed.append(name)
+    engine.dispose()
+
+    if failed:
+        print(f"без индекса: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Бенчмарк потоковой выгрузки: пиковый RSS процесса при экспорте N транзакций.
+
+    python -m bench.export_rss --rows 1000000 --format ndjson
+    python -m bench.export_rss --rows 1000000 --mode list   # старый путь через List[ReadTransaction]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss в Linux — килобайты
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed(db_url: str, rows: int) -> None:
+    from sqlmodel import SQLModel, create_engine
+    from app.models.finance_models import User, Category, Transaction
+
+    engine = create_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    start = datetime(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{"id": 1, "username": "u", "email": "u@x", "hashed_password": "-"}])
+        conn.execute(Category.__table__.insert(), [{"id": 1, "name": "food"}])
+        batch = []
+        for i in range(rows):
+            batch.append({
+                "user_id": 1, "category_id": 1, "account_id": None,
+                "amount": -1250, "currency": "RUB", "description": f"coffee #{i}",
+                "created_at": start + timedelta(minutes=i),
+            })
+            if len(batch) == 50_000:
+                conn.execute(Transaction.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Transaction.__table__.insert(), batch)
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--mode", choices=["stream", "list"], default="stream")
+    parser.add_argument("--db", default=None, help="готовый PR1_DB_URL; по умолчанию временная SQLite")
+    args = parser.parse_args()
+
+    db_url = args.db
+    if db_url is None:
+        path = os.path.join(tempfile.mkdtemp(), "export_bench.db")
+        db_url = f"sqlite:///{path}"
+        # Наполняем базу в отдельном процессе, чтобы не портить замер RSS
+        proc = multiprocessing.Process(target=seed, args=(db_url, args.rows))
+        proc.start()
+        proc.join()
+    os.environ["PR1_DB_URL"] = db_url
+
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    total_bytes = 0
+
+    if args.mode == "stream":
+        from app.routers import exports
+        exports.engine.echo = False
+        chunks = exports.iter_csv(1) if args.format == "csv" else exports.iter_ndjson(1)
+        for chunk in chunks:
+            total_bytes += len(chunk)
+    else:
+        from sqlmodel import Session, select
+        from app.db.connection import engine
+        from app.models.finance_models import Transaction
+        from app.schemas.finance_schemas import ReadTransaction
+        engine.echo = False
+        with Session(engine) as session:
+            rows = session.exec(select(Transaction).where(Transaction.user_id == 1)).all()
+            items = [ReadTransaction(**r.dict()).json() for r in rows]
+            total_bytes = sum(len(i) for i in items)
+
+    elapsed = time.perf_counter() - started
+    print(f"mode={args.mode} format={args.format} rows={args.rows}", file=sys.stderr)
+    print(f"bytes={total_bytes} elapsed={elapsed:.1f}s", file=sys.stderr)
+    print(f"peak_rss_before={rss_before:.1f}MB peak_rss_after={peak_rss_mb():.1f}MB", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
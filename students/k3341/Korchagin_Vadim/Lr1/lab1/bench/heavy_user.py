@@ -0,0 +1,74 @@
+"""
+GET /users/{id} для «тяжёлого» пользователя: время ответа и пик памяти
+до (все связи через selectinload) и после (include + transactions_limit).
+
+    python -m bench.heavy_user --transactions 500000
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bench.export_rss import seed
+
+
+def measure(label: str, fn, repeat: int) -> None:
+    fn()  # прогрев
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        size = fn()
+    elapsed = (time.perf_counter() - started) / repeat
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms  peak {peak / 2**20:8.1f} MB  body {size / 1024:9.1f} KB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'heavy.db')}"
+    proc = multiprocessing.Process(target=seed, args=(db_url, args.transactions))
+    proc.start()
+    proc.join()
+    os.environ["PR1_DB_URL"] = db_url
+
+    from sqlalchemy.orm import selectinload
+    from sqlmodel import Session, select
+    from fastapi.testclient import TestClient
+    from app.db.connection import engine
+    from app.main import app
+    from app.models.finance_models import User
+    from app.schemas.finance_schemas import ReadUserWithRelations
+
+    def legacy():
+        # Старое поведение эндпоинта: все пять коллекций целиком
+        with Session(engine) as session:
+            user = session.exec(
+                select(User).where(User.id == 1).options(
+                    selectinload(User.accounts),
+                    selectinload(User.transactions),
+                    selectinload(User.budgets),
+                    selectinload(User.goals),
+                    selectinload(User.category_preferences)
+                )
+            ).first()
+            body = ReadUserWithRelations(**user.dict(), **{
+                name: getattr(user, name)
+                for name in ("accounts", "transactions", "budgets", "goals", "category_preferences")
+            }).json()
+            return len(body)
+
+    client = TestClient(app)
+    measure("before: all relations", legacy, args.repeat)
+    measure("after: default (transactions_limit=50)", lambda: len(client.get("/users/1").content), args.repeat)
+    measure("after: include=accounts,goals", lambda: len(client.get("/users/1?include=accounts,goals").content), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Латентность посторонних эндпоинтов во время шторма логинов.
+
+Пока --storm клиентов непрерывно логинятся, отдельный клиент дёргает GET /categories/
+и копит задержки. Сравниваются bcrypt в потоке запроса (PR1_HASH_WORKERS=0)
+и в пуле процессов.
+
+    python -m bench.login_storm --storm 64 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+from bench.load_modes import start_server
+
+
+async def storm(base_url: str, clients: int, duration: float) -> dict:
+    codes = Counter()
+    probe_latencies = []
+    deadline = time.perf_counter() + duration
+    credentials = {"username_or_email": "storm", "password": "storm-password"}
+
+    async def login_loop(client: httpx.AsyncClient):
+        while time.perf_counter() < deadline:
+            response = await client.post("/auth/login", json=credentials)
+            codes[response.status_code] += 1
+
+    async def probe_loop(client: httpx.AsyncClient):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await client.get("/categories/")
+            probe_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=clients + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        await asyncio.gather(probe_loop(client), *(login_loop(client) for _ in range(clients)))
+
+    probe_latencies.sort()
+    return {
+        "logins": dict(codes),
+        "probe_p50_ms": round(statistics.median(probe_latencies) * 1000, 1),
+        "probe_p99_ms": round(probe_latencies[max(int(len(probe_latencies) * 0.99) - 1, 0)] * 1000, 1),
+        "probes": len(probe_latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--storm", type=int, default=32, help="одновременных логинящихся клиентов")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, 4))
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    for workers in (0, args.workers):
+        db_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'storm.db')}"
+        proc = start_server("sync", db_url, args.port, PR1_HASH_WORKERS=str(workers))
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            httpx.post(f"{base_url}/auth/register", json={
+                "username": "storm", "email": "storm@x", "password": "storm-password"
+            }, timeout=30)
+            result = asyncio.run(storm(base_url, args.storm, args.duration))
+            print(f"hash_workers={workers}", result)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Накладные расходы /metrics.
+
+1) Стоимость MetricsMiddleware на запрос: та же ASGI-заглушка с middleware и без,
+   разница в микросекундах — детерминированная оценка.
+2) Пропускная способность uvicorn с метриками и без (PR1_METRICS_ENABLED=false),
+   прогоны чередуются. Разброс между прогонами на одной машине обычно больше 2%,
+   поэтому порог проверяется по оценке: стоимость на запрос * rps без метрик.
+
+    python -m bench.metrics_overhead --requests 5000 --concurrency 50 --rounds 3
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from bench.load_modes import run_load, seed, start_server
+
+
+def middleware_cost_us(iterations: int) -> float:
+    from app.core.metrics import MetricsMiddleware
+
+    class Route:
+        path = "/transactions/{transaction_id}"
+
+    async def app(scope, receive, send):
+        scope["route"] = Route
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message):
+        pass
+
+    async def run(handler) -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await handler({"type": "http", "method": "GET", "path": "/transactions/1"}, None, send)
+        return time.perf_counter() - started
+
+    wrapped = MetricsMiddleware(app)
+    bare = min(asyncio.run(run(app)) for _ in range(3))
+    instrumented = min(asyncio.run(run(wrapped)) for _ in range(3))
+    return (instrumented - bare) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--budget", type=float, default=2.0, help="допустимая потеря пропускной способности, %%")
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    cost_us = middleware_cost_us(args.iterations)
+    print(f"middleware cost: {cost_us:.2f} us per request")
+
+    db_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'metrics.db')}"
+    base_url = f"http://127.0.0.1:{args.port}"
+    proc = start_server("sync", db_url, args.port)
+    try:
+        seed(base_url, args.seed)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    rps = {"false": [], "true": []}
+    for round_no in range(args.rounds):
+        for enabled in ("false", "true"):
+            proc = start_server("sync", db_url, args.port, PR1_METRICS_ENABLED=enabled)
+            try:
+                # Прогрев: первые запросы открывают соединения и греют кэши
+                asyncio.run(run_load(base_url, args.concurrency * 4, args.concurrency))
+                result = asyncio.run(run_load(base_url, args.requests, args.concurrency))
+            finally:
+                proc.terminate()
+                proc.wait()
+            print(f"round {round_no + 1} metrics={enabled}", result)
+            rps[enabled].append(result["rps"])
+
+    without, with_metrics = max(rps["false"]), max(rps["true"])
+    measured = (1 - with_metrics / without) * 100
+    # Один процесс uvicorn: на запрос уходит ~1/rps секунды CPU, middleware добавляет cost_us
+    estimated = cost_us * without / 1e6 * 100
+    print(f"best rps without metrics: {without}, with metrics: {with_metrics} (measured loss {measured:.2f}%)")
+    print(f"estimated loss: {estimated:.3f}% (budget {args.budget}%)")
+    if estimated > args.budget:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
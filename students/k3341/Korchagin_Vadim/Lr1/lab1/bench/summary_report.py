@@ -0,0 +1,89 @@
+"""
+GET /reports/summary для пользователя с 5 годами ежедневных транзакций:
+живой расчёт против снапшота закрытых месяцев.
+
+    python -m bench.summary_report --years 5 --per-day 20
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+
+def seed(db_url: str, years: int, per_day: int) -> None:
+    from sqlmodel import SQLModel, create_engine
+    from app.models.finance_models import User, Category, Transaction
+
+    engine = create_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    rnd = random.Random(42)
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    start = today - timedelta(days=365 * years)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{"id": 1, "username": "u", "email": "u@x", "hashed_password": "-"}])
+        conn.execute(Category.__table__.insert(), [{"id": i, "name": f"category {i}"} for i in range(1, 11)])
+        rows = []
+        for day in range((today - start).days + 1):
+            moment = start + timedelta(days=day)
+            for i in range(per_day):
+                # Раз в месяц зарплата, остальное — расходы по случайным категориям
+                salary = moment.day == 1 and i == 0
+                rows.append({
+                    "user_id": 1,
+                    "category_id": 1 if salary else rnd.randint(2, 10),
+                    "amount": 15_000_000 if salary else -rnd.randint(100, 500_000),
+                    "currency": "RUB",
+                    "created_at": moment + timedelta(minutes=i),
+                })
+        conn.execute(Transaction.__table__.insert(), rows)
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--per-day", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'summary.db')}"
+    proc = multiprocessing.Process(target=seed, args=(db_url, args.years, args.per_day))
+    proc.start()
+    proc.join()
+    os.environ["PR1_DB_URL"] = db_url
+
+    from fastapi.testclient import TestClient
+    from sqlmodel import Session
+    from app.core import config
+    from app.db.connection import engine
+    from app.db.reports import HISTORY_START, refresh_snapshots
+    from app.main import app
+
+    client = TestClient(app)
+    params = {"user_id": 1, "months": args.years * 12}
+
+    def run() -> None:
+        assert client.get("/reports/summary", params=params).status_code == 200
+
+    config.REPORT_SNAPSHOTS_ENABLED = False
+    live = min(timeit.repeat(run, number=1, repeat=args.repeat))
+
+    current_month = datetime.utcnow().date().replace(day=1)
+    refresh_started = timeit.default_timer()
+    with Session(engine) as session:
+        refresh_snapshots(session, HISTORY_START, current_month)
+    refresh = timeit.default_timer() - refresh_started
+
+    config.REPORT_SNAPSHOTS_ENABLED = True
+    snapshot = min(timeit.repeat(run, number=1, repeat=args.repeat))
+
+    print(f"transactions={args.years * 365 * args.per_day} months={params['months']}")
+    print(f"live:     {live * 1000:8.1f} ms")
+    print(f"snapshot: {snapshot * 1000:8.1f} ms (refresh job took {refresh * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,19 @@ if config.config_file_name is not None:
 
 target_metadata = SQLModel.metadata 
 
+# Поисковые объекты (tsvector, FTS5) создаются миграцией вручную, в моделях их нет
+from app.db.search import SEARCH_COLUMNS, SEARCH_TABLES
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == "table" and name in SEARCH_TABLES:
+        return False
+    if type_ == "column" and (obj.table.name, name) in SEARCH_COLUMNS:
+        return False
+    if type_ == "index" and name == "ix_transaction_search_vector":
+        return False
+    return True
+
 def run_migrations_offline() -> None:
     # Запуск миграций без подклчючения к БД.
     url = config.get_main_option("sqlalchemy.url")
@@ -32,6 +45,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -47,7 +61,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
         with context.begin_transaction():
             context.run_migrations()
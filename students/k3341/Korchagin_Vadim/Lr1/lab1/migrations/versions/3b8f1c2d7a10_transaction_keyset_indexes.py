@@ -0,0 +1,33 @@
+"""Transaction keyset pagination indexes
+
+Revision ID: 3b8f1c2d7a10
+Revises: cf073d63845c
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f1c2d7a10'
+down_revision = 'cf073d63845c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_transaction_created_at_id', 'transaction',
+        ['created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_transaction_user_id_created_at_id', 'transaction',
+        ['user_id', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transaction_user_id_created_at_id', table_name='transaction')
+    op.drop_index('ix_transaction_created_at_id', table_name='transaction')
@@ -0,0 +1,40 @@
+"""Category spending aggregate table
+
+Revision ID: 5e2a9d41c7b3
+Revises: 3b8f1c2d7a10
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2a9d41c7b3'
+down_revision = '3b8f1c2d7a10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('categoryspending',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'category_id', 'period')
+    )
+    # Заполняем агрегаты по уже существующим транзакциям
+    op.execute(
+        "INSERT INTO categoryspending (user_id, category_id, period, total, count) "
+        "SELECT user_id, category_id, date_trunc('month', created_at)::date, SUM(amount), COUNT(*) "
+        "FROM transaction GROUP BY 1, 2, 3"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('categoryspending')
@@ -0,0 +1,70 @@
+"""Money in integer minor units with currency
+
+Revision ID: 7c41e0b9d2f6
+Revises: 5e2a9d41c7b3
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '7c41e0b9d2f6'
+down_revision = '5e2a9d41c7b3'
+branch_labels = None
+depends_on = None
+
+# (таблица, колонка) — все денежные колонки, которые переводим в копейки
+MONEY_COLUMNS = [
+    ('transaction', 'amount'),
+    ('account', 'balance'),
+    ('budget', 'limit_amount'),
+    ('goal', 'target_amount'),
+    ('goal', 'current_amount'),
+    ('categoryspending', 'total'),
+]
+
+
+def upgrade() -> None:
+    for table, column in MONEY_COLUMNS:
+        op.alter_column(
+            table, column,
+            existing_type=sa.Float(),
+            type_=sa.BigInteger(),
+            existing_nullable=False,
+            postgresql_using=f'round({column} * 100)::bigint'
+        )
+
+    op.add_column('transaction', sa.Column(
+        'currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=False, server_default='RUB'
+    ))
+    op.add_column('account', sa.Column(
+        'currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=False, server_default='RUB'
+    ))
+
+    # Агрегаты, накопленные во float, пересчитываем точно из уже целых сумм
+    op.execute(
+        "UPDATE categoryspending SET total = agg.total FROM ("
+        "SELECT user_id, category_id, date_trunc('month', created_at)::date AS period, SUM(amount) AS total "
+        "FROM transaction GROUP BY 1, 2, 3"
+        ") AS agg "
+        "WHERE categoryspending.user_id = agg.user_id "
+        "AND categoryspending.category_id = agg.category_id "
+        "AND categoryspending.period = agg.period"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('account', 'currency')
+    op.drop_column('transaction', 'currency')
+
+    for table, column in MONEY_COLUMNS:
+        op.alter_column(
+            table, column,
+            existing_type=sa.BigInteger(),
+            type_=sa.Float(),
+            existing_nullable=False,
+            postgresql_using=f'{column} / 100.0'
+        )
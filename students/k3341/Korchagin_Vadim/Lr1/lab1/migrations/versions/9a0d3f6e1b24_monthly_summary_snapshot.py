@@ -0,0 +1,35 @@
+"""Monthly summary report snapshot
+
+Revision ID: 9a0d3f6e1b24
+Revises: 7c41e0b9d2f6
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '9a0d3f6e1b24'
+down_revision = '7c41e0b9d2f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('monthlysummarysnapshot',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('income', sa.BigInteger(), nullable=False),
+    sa.Column('expenses', sa.BigInteger(), nullable=False),
+    sa.Column('net', sa.BigInteger(), nullable=False),
+    sa.Column('top_categories', sa.JSON(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'period')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('monthlysummarysnapshot')
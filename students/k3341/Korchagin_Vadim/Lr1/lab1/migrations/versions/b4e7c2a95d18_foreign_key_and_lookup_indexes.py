@@ -0,0 +1,47 @@
+"""Foreign key and lookup indexes
+
+Revision ID: b4e7c2a95d18
+Revises: 9a0d3f6e1b24
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e7c2a95d18'
+down_revision = '9a0d3f6e1b24'
+branch_labels = None
+depends_on = None
+
+# transaction.user_id покрыт ix_transaction_user_id_created_at_id,
+# а user_id в составных первичных ключах — самими ключами
+FK_INDEXES = [
+    ('transaction', 'category_id'),
+    ('transaction', 'account_id'),
+    ('budget', 'user_id'),
+    ('budget', 'category_id'),
+    ('account', 'user_id'),
+    ('goal', 'user_id'),
+    ('usercategorypreference', 'category_id'),
+    ('categoryspending', 'category_id'),
+]
+
+
+def upgrade() -> None:
+    for table, column in FK_INDEXES:
+        op.create_index(f'ix_{table}_{column}', table, [column], unique=False)
+
+    # Если в базе уже есть дубликаты логинов/почт, их нужно разобрать до миграции
+    op.create_index('ix_user_username', 'user', ['username'], unique=True)
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_email', table_name='user')
+    op.drop_index('ix_user_username', table_name='user')
+
+    for table, column in reversed(FK_INDEXES):
+        op.drop_index(f'ix_{table}_{column}', table_name=table)
@@ -0,0 +1,70 @@
+"""Full-text search over transaction descriptions
+
+Revision ID: d61f8a3c5e27
+Revises: b4e7c2a95d18
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd61f8a3c5e27'
+down_revision = 'b4e7c2a95d18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE "transaction" ADD COLUMN search_vector tsvector')
+        op.execute("""
+            CREATE FUNCTION transaction_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := to_tsvector('simple', coalesce(NEW.description, ''));
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute("""
+            CREATE TRIGGER transaction_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF description ON "transaction"
+            FOR EACH ROW EXECUTE FUNCTION transaction_search_vector_update()
+        """)
+        op.execute("""UPDATE "transaction" SET search_vector = to_tsvector('simple', coalesce(description, ''))""")
+        op.execute('CREATE INDEX ix_transaction_search_vector ON "transaction" USING gin (search_vector)')
+    else:
+        op.execute("""
+            CREATE VIRTUAL TABLE transaction_fts
+            USING fts5(description, content='transaction', content_rowid='id')
+        """)
+        op.execute("""
+            CREATE TRIGGER transaction_fts_insert AFTER INSERT ON "transaction" BEGIN
+                INSERT INTO transaction_fts(rowid, description) VALUES (new.id, new.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER transaction_fts_delete AFTER DELETE ON "transaction" BEGIN
+                INSERT INTO transaction_fts(transaction_fts, rowid, description) VALUES ('delete', old.id, old.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER transaction_fts_update AFTER UPDATE OF description ON "transaction" BEGIN
+                INSERT INTO transaction_fts(transaction_fts, rowid, description) VALUES ('delete', old.id, old.description);
+                INSERT INTO transaction_fts(rowid, description) VALUES (new.id, new.description);
+            END
+        """)
+        op.execute("INSERT INTO transaction_fts(transaction_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX ix_transaction_search_vector')
+        op.execute('DROP TRIGGER transaction_search_vector_trigger ON "transaction"')
+        op.execute('DROP FUNCTION transaction_search_vector_update()')
+        op.execute('ALTER TABLE "transaction" DROP COLUMN search_vector')
+    else:
+        op.execute('DROP TRIGGER transaction_fts_update')
+        op.execute('DROP TRIGGER transaction_fts_delete')
+        op.execute('DROP TRIGGER transaction_fts_insert')
+        op.execute('DROP TABLE transaction_fts')
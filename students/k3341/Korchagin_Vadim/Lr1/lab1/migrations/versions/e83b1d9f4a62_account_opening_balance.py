@@ -0,0 +1,32 @@
+"""Account opening balance for reconciliation
+
+Revision ID: e83b1d9f4a62
+Revises: d61f8a3c5e27
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e83b1d9f4a62'
+down_revision = 'd61f8a3c5e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('account', sa.Column('opening_balance', sa.BigInteger(), server_default='0', nullable=False))
+    # Текущий баланс считаем верным: всё, что не объясняется транзакциями, — начальный остаток.
+    # Расхождения после этого не видны, поэтому до миграции посмотреть отчёт
+    # python -m app.db.reconcile: без opening_balance он сравнивает баланс с суммой транзакций,
+    # и в нём будут и настоящие расхождения, и счета, открытые с ненулевым остатком.
+    op.execute(
+        'UPDATE account SET opening_balance = balance - '
+        '(SELECT COALESCE(SUM(t.amount), 0) FROM "transaction" t WHERE t.account_id = account.id)'
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('account', 'opening_balance')
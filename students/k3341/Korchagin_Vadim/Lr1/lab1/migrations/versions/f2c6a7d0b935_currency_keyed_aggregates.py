@@ -0,0 +1,99 @@
+"""Budget currency and currency-keyed spending aggregates
+
+Revision ID: f2c6a7d0b935
+Revises: e83b1d9f4a62
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a7d0b935'
+down_revision = 'e83b1d9f4a62'
+branch_labels = None
+depends_on = None
+
+
+def month_start_sql() -> str:
+    if op.get_bind().dialect.name == "sqlite":
+        return "date(created_at, 'start of month')"
+    return "date_trunc('month', created_at)::date"
+
+
+def create_categoryspending(with_currency: bool) -> None:
+    columns = [
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.Date(), nullable=False),
+    ]
+    key = ['user_id', 'category_id', 'period']
+    if with_currency:
+        columns.append(sa.Column('currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=False))
+        key.append('currency')
+    op.create_table('categoryspending',
+    *columns,
+    sa.Column('total', sa.BigInteger(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint(*key)
+    )
+    op.create_index('ix_categoryspending_category_id', 'categoryspending', ['category_id'], unique=False)
+
+    # Агрегаты производные — пересчитываем из транзакций, а не переносим старые строки
+    group = "user_id, category_id, period, currency" if with_currency else "user_id, category_id, period"
+    op.execute(
+        f"INSERT INTO categoryspending ({group}, total, count) "
+        f"SELECT user_id, category_id, {month_start_sql()} AS period"
+        f"{', currency' if with_currency else ''}, SUM(amount), COUNT(*) "
+        f'FROM "transaction" GROUP BY {group}'
+    )
+
+
+def create_monthlysummarysnapshot(with_currency: bool) -> None:
+    columns = [
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.Date(), nullable=False),
+    ]
+    key = ['user_id', 'period']
+    if with_currency:
+        columns.append(sa.Column('currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=False))
+        key.append('currency')
+    op.create_table('monthlysummarysnapshot',
+    *columns,
+    sa.Column('income', sa.BigInteger(), nullable=False),
+    sa.Column('expenses', sa.BigInteger(), nullable=False),
+    sa.Column('net', sa.BigInteger(), nullable=False),
+    sa.Column('top_categories', sa.JSON(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint(*key)
+    )
+
+
+def upgrade() -> None:
+    op.add_column('budget', sa.Column(
+        'currency', sqlmodel.sql.sqltypes.AutoString(length=3), nullable=False, server_default='RUB'
+    ))
+
+    # Старые строки складывали суммы разных валют; первичный ключ меняется,
+    # поэтому таблицы пересоздаются. Снапшот после миграции пустой —
+    # заполнить его: python -m app.db.reports --full
+    op.drop_table('monthlysummarysnapshot')
+    create_monthlysummarysnapshot(with_currency=True)
+    op.drop_index('ix_categoryspending_category_id', table_name='categoryspending')
+    op.drop_table('categoryspending')
+    create_categoryspending(with_currency=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_categoryspending_category_id', table_name='categoryspending')
+    op.drop_table('categoryspending')
+    create_categoryspending(with_currency=False)
+    op.drop_table('monthlysummarysnapshot')
+    create_monthlysummarysnapshot(with_currency=False)
+
+    op.drop_column('budget', 'currency')
@@ -0,0 +1,70 @@
+"""
+Тесты гоняют приложение через TestClient на временной SQLite.
+Настройки читаются при импорте app.core.config, поэтому окружение
+задаётся здесь, до первого импорта app.
+
+    python -m pytest -q
+"""
+import os
+import tempfile
+
+os.environ["PR1_DB_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ.setdefault("PR1_DB_MODE", "sync")
+os.environ["PR1_BCRYPT_ROUNDS"] = "4"
+# Хэшируем в потоке запроса: дочерние процессы тестам не нужны
+os.environ["PR1_HASH_WORKERS"] = "0"
+os.environ["PR1_NOTIFY_SINK"] = "memory"
+# Воркер приложения не проверяет бюджеты посреди чужих тестов (его запросы
+# попадали бы в подсчёты); сам воркер проверяется в test_notifications
+os.environ["PR1_NOTIFY_COALESCE_SECONDS"] = "3600"
+os.environ["PR1_DB_REPLICA_URLS"] = ""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel
+
+from app.core import http_cache
+from app.core.user_cache import get_user_cache
+from app.db.connection import engine
+from app.main import app
+
+PASSWORD = "secret"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def clean_db(client):
+    """Пустые таблицы и кэши перед каждым тестом; id в SQLite снова начинаются с 1."""
+    with engine.begin() as connection:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            connection.execute(table.delete())
+    get_user_cache().clear()
+    http_cache._response_cache.clear()
+    client.cookies.clear()
+    yield
+
+
+@pytest.fixture
+def user(client) -> dict:
+    response = client.post("/auth/register", json={"username": "user", "email": "user@example.com", "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def category(client) -> dict:
+    response = client.post("/categories/", json={"name": "food"})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def account(client, user) -> dict:
+    response = client.post("/accounts/", json={"user_id": user["id"], "name": "main", "balance": "100.00"})
+    assert response.status_code == 200, response.text
+    return response.json()
@@ -0,0 +1,26 @@
+"""
+PR1_DB_MODE читается при импорте приложения, поэтому async-режим проверяем
+отдельным прогоном тех же тестов в дочернем процессе.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.core import config
+
+ROOT = Path(__file__).parent.parent
+ASYNC_MODULES = ["tests/test_auth.py", "tests/test_balances.py", "tests/test_currency.py", "tests/test_write_round_trips.py"]
+
+
+@pytest.mark.skipif(config.DB_MODE == "async", reason="уже идёт прогон в async-режиме")
+def test_suite_in_async_mode():
+    env = {key: value for key, value in os.environ.items() if not key.startswith("PR1_")}
+    env["PR1_DB_MODE"] = "async"
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *ASYNC_MODULES],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=300,
+    )
+    assert result.returncode == 0, result.stdout[-3000:] + result.stderr[-3000:]
@@ -0,0 +1,45 @@
+from conftest import PASSWORD
+from app.core.hashing import HashingPool, _hash, _verify
+
+
+def login(client, password=PASSWORD):
+    return client.post("/auth/login", json={"username_or_email": "user", "password": password})
+
+
+def test_login_me_and_change_password(client, user):
+    assert login(client, "wrong").status_code == 401
+    token = login(client).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/auth/me", headers=headers).json()["id"] == user["id"]
+    # Второй раз — из кэша пользователей
+    assert client.get("/auth/me", headers=headers).json()["username"] == "user"
+
+    response = client.patch("/auth/change-password", headers=headers,
+                            params={"old_password": PASSWORD, "new_password": "changed"})
+    assert response.status_code == 200, response.text
+    assert login(client).status_code == 401
+    assert login(client, "changed").status_code == 200
+
+
+def test_duplicate_registration(client, user):
+    response = client.post("/auth/register", json={"username": "user", "email": "x@example.com", "password": "pw"})
+    assert response.status_code == 400
+
+
+def test_deleted_user_gets_401(client, user):
+    headers = {"Authorization": f"Bearer {login(client).json()['access_token']}"}
+    client.delete(f"/users/{user['id']}")
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_hashing_pool_uses_forkserver():
+    pool = HashingPool(workers=1, queue_limit=0)
+    pool.start()
+    try:
+        assert pool._executor._mp_context.get_start_method() == "forkserver"
+        hashed = pool.run(_hash, PASSWORD)
+        assert pool.run(_verify, PASSWORD, hashed)
+    finally:
+        pool.shutdown()
+    assert pool._executor is None
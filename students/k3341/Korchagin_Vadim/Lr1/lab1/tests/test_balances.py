@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from sqlmodel import Session
+
+from app.db.balances import adjust_balance
+from app.db.connection import engine
+from app.models.finance_models import Account
+
+REQUESTS = 200
+
+
+def amounts():
+    # Списания и пополнения вперемешку, в сумме не ноль
+    return [Decimal((i % 7) - 3) + Decimal("0.25") for i in range(REQUESTS)]
+
+
+def test_concurrent_creates_keep_balance(client, user, category, account):
+    def create(amount):
+        return client.post("/transactions/", json={
+            "user_id": user["id"], "category_id": category["id"], "account_id": account["id"], "amount": str(amount),
+        })
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        responses = list(pool.map(create, amounts()))
+
+    assert [r.status_code for r in responses] == [200] * REQUESTS
+    balance = Decimal(client.get(f"/accounts/{account['id']}").json()["balance"])
+    assert balance == Decimal(account["balance"]) + sum(amounts())
+
+
+def test_concurrent_adjust_balance_loses_no_updates(account):
+    def adjust(delta):
+        with Session(engine) as session:
+            assert adjust_balance(session, account["id"], delta)
+            session.commit()
+
+    deltas = [(i % 5) - 1 for i in range(REQUESTS)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(adjust, deltas))
+
+    with Session(engine) as session:
+        assert session.get(Account, account["id"]).balance == 100_00 + sum(deltas)
+
+
+def test_adjust_balance_of_missing_account():
+    with Session(engine) as session:
+        assert not adjust_balance(session, 999, 100)
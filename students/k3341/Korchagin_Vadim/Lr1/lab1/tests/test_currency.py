@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+from sqlalchemy import delete
+
+from app.db import transactions
+from app.models.finance_models import Account
+
+
+def create_transaction(client, user, category, account=None, amount="-10.00", currency="RUB"):
+    return client.post("/transactions/", json={
+        "user_id": user["id"], "category_id": category["id"],
+        "account_id": account["id"] if account else None,
+        "amount": amount, "currency": currency,
+    })
+
+
+def test_currency_mismatch_is_rejected(client, user, category, account):
+    response = create_transaction(client, user, category, account, currency="USD")
+    assert response.status_code == 400
+    assert Decimal(client.get(f"/accounts/{account['id']}").json()["balance"]) == Decimal("100.00")
+
+    created = create_transaction(client, user, category, account).json()
+    response = client.patch(f"/transactions/{created['id']}", json={
+        "user_id": user["id"], "category_id": category["id"], "account_id": account["id"],
+        "amount": "-10.00", "currency": "USD",
+    })
+    assert response.status_code == 400
+    assert Decimal(client.get(f"/accounts/{account['id']}").json()["balance"]) == Decimal("90.00")
+
+
+def test_bulk_currency_mismatch_is_reported(client, user, category, account):
+    item = {"user_id": user["id"], "category_id": category["id"], "account_id": account["id"], "amount": "-1.00"}
+    response = client.post("/transactions/bulk", json=[item, {**item, "currency": "USD"}])
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["created"] == 1
+    assert [error["index"] for error in result["errors"]] == [1]
+
+
+def test_budget_usage_counts_only_budget_currency(client, user, category):
+    create_transaction(client, user, category, amount="-30.00")
+    create_transaction(client, user, category, amount="-1000.00", currency="USD")
+
+    budget = client.post("/budgets/", json={
+        "user_id": user["id"], "category_id": category["id"], "limit_amount": "100.00",
+    }).json()
+    usage = client.get(f"/budgets/{budget['id']}/usage").json()
+    assert usage["currency"] == "RUB"
+    assert Decimal(usage["spent"]) == Decimal("30.00")
+    assert usage["transactions_count"] == 1
+
+
+def test_report_is_per_currency(client, user, category):
+    create_transaction(client, user, category, amount="-30.00")
+    create_transaction(client, user, category, amount="-5.00", currency="USD")
+
+    report = client.get("/reports/summary", params={"user_id": user["id"], "months": 1, "currency": "USD"}).json()
+    assert report["currency"] == "USD"
+    assert [Decimal(month["expenses"]) for month in report["months"]] == [Decimal("5.00")]
+
+
+def test_account_patch_keeps_currency_when_absent(client, user):
+    account = client.post("/accounts/", json={"user_id": user["id"], "name": "usd", "currency": "USD"}).json()
+    response = client.patch(f"/accounts/{account['id']}", json={"user_id": user["id"], "name": "dollars"})
+    assert response.status_code == 200, response.text
+    assert response.json()["currency"] == "USD"
+
+    response = client.patch(f"/accounts/{account['id']}", json={"user_id": user["id"], "name": "euro", "currency": "EUR"})
+    assert response.status_code == 200, response.text
+    assert response.json()["currency"] == "EUR"
+
+
+def test_account_with_transactions_cannot_change_currency(client, user, category, account):
+    create_transaction(client, user, category, account)
+    patch = {"user_id": user["id"], "name": "main", "balance": "90.00"}
+
+    response = client.patch(f"/accounts/{account['id']}", json={**patch, "currency": "USD"})
+    assert response.status_code == 409
+    assert client.get(f"/accounts/{account['id']}").json()["currency"] == "RUB"
+    # Та же валюта явно — не смена
+    assert client.patch(f"/accounts/{account['id']}", json={**patch, "currency": "RUB"}).status_code == 200
+
+
+def test_account_deleted_after_reference_check_is_404(client, user, category, account, monkeypatch):
+    created = create_transaction(client, user, category).json()
+    ensure_references = transactions.ensure_references
+
+    def ensure_then_delete(session, **refs):
+        ensure_references(session, **refs)
+        # Счёт удаляют между проверкой ссылок и UPDATE баланса
+        session.execute(delete(Account).where(Account.id == account["id"]))
+
+    monkeypatch.setattr(transactions, "ensure_references", ensure_then_delete)
+    response = create_transaction(client, user, category, account)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Account not found"
+
+    response = client.patch(f"/transactions/{created['id']}", json={
+        "user_id": user["id"], "category_id": category["id"], "account_id": account["id"], "amount": "-10.00",
+    })
+    assert response.status_code == 404
+    # Ошибка откатывает и удаление: счёт на месте, баланс не тронут
+    assert Decimal(client.get(f"/accounts/{account['id']}").json()["balance"]) == Decimal("100.00")
@@ -0,0 +1,19 @@
+import pytest
+from sqlmodel import create_engine
+
+from bench.explain_hot_queries import explain, hot_queries, seed, uses_full_scan
+
+
+@pytest.fixture(scope="module")
+def explain_engine(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('explain') / 'explain.db'}")
+    seed(engine, users=50, per_user=20)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", list(hot_queries()))
+def test_hot_query_uses_index(explain_engine, name):
+    with explain_engine.connect() as conn:
+        plan = explain(conn, hot_queries()[name])
+    assert not uses_full_scan(conn.dialect.name, plan), plan
@@ -0,0 +1,36 @@
+from sqlmodel import Session
+
+from app.core import config
+from app.db.connection import engine
+from app.models.finance_models import Category
+
+
+def test_etag_revalidation(client, category):
+    first = client.get("/categories/")
+    etag = first.headers["etag"]
+    assert client.get("/categories/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/categories/", json={"name": "rent"})
+    second = client.get("/categories/", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+
+
+def test_not_modified_expires_with_ttl(client, category, monkeypatch):
+    monkeypatch.setattr(config, "HTTP_CACHE_TTL_SECONDS", 0)
+    etag = client.get("/categories/").headers["etag"]
+
+    # Запись мимо этого процесса (другой воркер): bump сюда не приходит
+    with Session(engine) as session:
+        session.add(Category(name="rent"))
+        session.commit()
+
+    response = client.get("/categories/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()] == ["food", "rent"]
+    assert client.get("/categories/", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+
+def test_if_modified_since_is_ignored(client, category):
+    response = client.get("/categories/", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert response.status_code == 200
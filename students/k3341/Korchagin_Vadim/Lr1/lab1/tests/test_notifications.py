@@ -0,0 +1,72 @@
+import asyncio
+from datetime import date
+
+from app.core import config
+from app.core.notifications import (
+    BudgetEventWorker, InMemorySink, LogSink, WebhookSink, create_sink, find_overruns
+)
+from app.db.connection import engine
+
+
+def spend(client, user, category, amount):
+    response = client.post("/transactions/", json={
+        "user_id": user["id"], "category_id": category["id"], "amount": amount,
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_overrun_notifies_again_after_returning_under_limit(client, user, category):
+    client.post("/budgets/", json={"user_id": user["id"], "category_id": category["id"], "limit_amount": "100.00"})
+    notified = {date(2000, 1, 1): {1, 2, 3}}
+
+    big = spend(client, user, category, "-150.00")
+    assert len(find_overruns(engine, user["id"], category["id"], notified)) == 1
+    assert find_overruns(engine, user["id"], category["id"], notified) == []
+    # Прошлые месяцы выброшены, в текущем — только этот бюджет
+    assert len(notified) == 1 and len(next(iter(notified.values()))) == 1
+
+    client.delete(f"/transactions/{big['id']}")
+    assert find_overruns(engine, user["id"], category["id"], notified) == []
+    assert next(iter(notified.values())) == set()
+
+    spend(client, user, category, "-120.00")
+    assert len(find_overruns(engine, user["id"], category["id"], notified)) == 1
+
+
+def test_webhook_sink_requires_url(monkeypatch):
+    monkeypatch.setattr(config, "NOTIFY_SINK", "webhook")
+    monkeypatch.setattr(config, "NOTIFY_WEBHOOK_URL", None)
+    assert isinstance(create_sink(), LogSink)
+
+    monkeypatch.setattr(config, "NOTIFY_WEBHOOK_URL", "http://localhost/hook")
+    assert isinstance(create_sink(), WebhookSink)
+
+
+class CountingWorker(BudgetEventWorker):
+    evaluations = 0
+
+    async def evaluate(self, user_id, category_id):
+        self.evaluations += 1
+        await super().evaluate(user_id, category_id)
+
+
+def test_burst_of_events_is_evaluated_once(client, user, category):
+    client.post("/budgets/", json={"user_id": user["id"], "category_id": category["id"], "limit_amount": "100.00"})
+    for _ in range(5):
+        spend(client, user, category, "-30.00")
+
+    async def burst():
+        worker = CountingWorker(engine, InMemorySink(), coalesce_seconds=0.05)
+        worker.start()
+        try:
+            for _ in range(100):
+                worker.publish(user["id"], category["id"])
+            await asyncio.sleep(0.5)
+        finally:
+            await worker.stop()
+        return worker
+
+    worker = asyncio.run(burst())
+    assert worker.evaluations == 1
+    assert len(worker.sink.notifications) == 1
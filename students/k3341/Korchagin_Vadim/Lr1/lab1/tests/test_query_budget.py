@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, create_engine
+
+from app.core import config
+from app.db.connection import engine
+from app.db.query_metrics import QueryStats, _current, install_query_hooks
+from app.main import app
+from app.models.finance_models import Transaction
+from app.routers.budgets import get_budget_usage
+
+
+@pytest.fixture
+def strict(monkeypatch):
+    monkeypatch.setattr(config, "QUERY_BUDGET_MODE", "strict")
+
+
+@pytest.fixture
+def budget(client, user, category) -> dict:
+    response = client.post("/budgets/", json={"user_id": user["id"], "category_id": category["id"], "limit_amount": "10"})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_over_budget_endpoint_fails_in_strict_mode(client, budget, strict, monkeypatch):
+    assert client.get(f"/budgets/{budget['id']}/usage").status_code == 200
+
+    monkeypatch.setattr(get_budget_usage, "query_budget", 1)
+    # Клиент видит то же, что и в проде: 500 вместо ответа
+    response = TestClient(app, raise_server_exceptions=False).get(f"/budgets/{budget['id']}/usage")
+    assert response.status_code == 500
+
+
+def test_over_budget_endpoint_only_warns_by_default(client, budget, monkeypatch):
+    monkeypatch.setattr(get_budget_usage, "query_budget", 1)
+    assert client.get(f"/budgets/{budget['id']}/usage").status_code == 200
+
+
+def test_closed_month_writes_fit_budget(client, user, category, account, strict):
+    # PATCH и DELETE транзакции закрытого месяца делают лишний запрос на сброс снапшота
+    with Session(engine) as session:
+        old = Transaction(user_id=user["id"], category_id=category["id"], account_id=account["id"],
+                          amount=-100, created_at=datetime.utcnow() - timedelta(days=62))
+        session.add(old)
+        session.commit()
+        old_id = old.id
+
+    response = client.patch(f"/transactions/{old_id}", json={
+        "user_id": user["id"], "category_id": category["id"], "account_id": account["id"], "amount": "-2.00",
+    })
+    assert response.status_code == 200, response.text
+    assert client.delete(f"/transactions/{old_id}").status_code == 200
+
+
+def test_failed_statement_leaves_no_timing_behind():
+    hooked = create_engine("sqlite://")
+    install_query_hooks(hooked)
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        with hooked.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 1"))
+            assert not conn.info.get("query_started")
+    finally:
+        _current.reset(token)
+    # Учтён только выполненный запрос, и его время не взято у упавших
+    assert stats.count == 1
+    assert 0 <= stats.seconds < 1
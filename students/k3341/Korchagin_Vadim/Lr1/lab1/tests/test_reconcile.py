@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import text, update
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.db.connection import engine
+from app.db.reconcile import reconcile
+from app.models.finance_models import Account, Category, User
+
+
+def drift(account_id: int, delta: int) -> None:
+    # Баланс, поменянный мимо транзакций
+    with Session(engine) as session:
+        session.execute(update(Account).where(Account.id == account_id).values(balance=Account.balance + delta))
+        session.commit()
+
+
+def test_drift_is_reported_and_fixed(client, user, category, account):
+    client.post("/transactions/", json={
+        "user_id": user["id"], "category_id": category["id"], "account_id": account["id"], "amount": "-10.00",
+    })
+    drift(account["id"], 123)
+
+    with Session(engine) as session:
+        report = reconcile(session)
+        assert [(item["account_id"], item["diff"]) for item in report["accounts"]] == [(account["id"], 123)]
+        assert reconcile(session, fix=True)["fixed"] == 1
+        assert reconcile(session)["mismatched"] == 0
+        assert session.get(Account, account["id"]).balance == 90_00
+
+
+def test_patch_moves_drift_into_opening_balance(client, user, account):
+    drift(account["id"], 123)
+    client.patch(f"/accounts/{account['id']}", json={"user_id": user["id"], "name": "main", "balance": "50.00"})
+
+    with Session(engine) as session:
+        assert reconcile(session)["mismatched"] == 0
+        assert session.get(Account, account["id"]).opening_balance == 50_00
+
+
+def test_report_before_opening_balance_migration(tmp_path):
+    old_engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    SQLModel.metadata.create_all(old_engine)
+    with old_engine.begin() as conn:
+        conn.execute(text("ALTER TABLE account DROP COLUMN opening_balance"))
+        conn.execute(User.__table__.insert(), [{"id": 1, "username": "u", "email": "u", "hashed_password": "-"}])
+        conn.execute(Category.__table__.insert(), [{"id": 1, "name": "food"}])
+        conn.execute(text("INSERT INTO account (id, user_id, name, balance, currency) VALUES "
+                          "(1, 1, 'ok', -100, 'RUB'), (2, 1, 'drift', 500, 'RUB')"))
+        conn.execute(text("INSERT INTO \"transaction\" (user_id, category_id, account_id, amount, currency, created_at) "
+                          "VALUES (1, 1, 1, -100, 'RUB', '2026-01-01 00:00:00.000000')"))
+
+    with Session(old_engine) as session:
+        report = reconcile(session)
+        assert [(item["account_id"], item["expected"]) for item in report["accounts"]] == [(2, 0)]
+        with pytest.raises(ValueError):
+            reconcile(session, fix=True)
+    old_engine.dispose()
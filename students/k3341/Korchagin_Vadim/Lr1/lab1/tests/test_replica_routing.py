@@ -0,0 +1,100 @@
+"""
+Чтение с реплик: основная база и две «реплики» — отдельные файлы SQLite.
+Реплики снимаются копией основной базы, после чего в основную пишется новая транзакция,
+то есть реплики отстают.
+"""
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core import config
+from app.db import connection, replicas
+from app.main import app
+from app.routers import monitoring
+from conftest import PASSWORD
+
+# С запасом: под нагрузкой запись и чтение вместе могут занять заметную долю секунды
+STICKY_SECONDS = 1.5
+
+
+@pytest.fixture
+def replica_paths(tmp_path, monkeypatch) -> list:
+    paths = [tmp_path / f"replica-{index}.db" for index in range(2)]
+    engines = [create_engine(f"sqlite:///{path}", **connection.engine_options(f"sqlite:///{path}")) for path in paths]
+    monkeypatch.setattr(connection, "replica_engines", engines)
+    async_engines = []
+    if connection.async_engine is not None:
+        async_engines = [create_async_engine(f"sqlite+aiosqlite:///{path}") for path in paths]
+        monkeypatch.setattr(connection, "async_replica_engines", async_engines)
+    monkeypatch.setattr(monitoring, "replica_engines", engines)
+    monkeypatch.setattr(connection, "replica_round_robin", replicas.RoundRobin(len(engines)))
+    monkeypatch.setattr(replicas, "recent_writes", replicas.RecentWrites(STICKY_SECONDS))
+    monkeypatch.setattr(config, "DB_REPLICA_STICKY_SECONDS", STICKY_SECONDS)
+    yield paths
+    for replica in engines:
+        replica.dispose()
+
+
+def replicate(paths: list) -> None:
+    source = sqlite3.connect(connection.engine.url.database)
+    for path in paths:
+        target = sqlite3.connect(path)
+        source.backup(target)
+        target.close()
+    source.close()
+
+
+@pytest.fixture
+def routed_app():
+    # Middleware липкости в app ставится только при PR1_DB_REPLICA_URLS, поэтому оборачиваем снаружи
+    return BaseHTTPMiddleware(app, dispatch=replicas.read_your_writes_middleware)
+
+
+def read(client, user, **kwargs):
+    response = client.get("/transactions/", params={"user_id": user["id"]}, **kwargs)
+    assert response.status_code == 200, response.text
+    return response.headers.get("x-db-target"), [item["id"] for item in response.json()["items"]]
+
+
+def test_read_your_writes(routed_app, replica_paths, user, category, account):
+    writer = TestClient(routed_app)
+    reader = TestClient(routed_app)
+    body = {"user_id": user["id"], "category_id": category["id"], "account_id": account["id"], "amount": "-1"}
+
+    writer.post("/transactions/", json=body)
+    replicate(replica_paths)
+    # Запись, которой на репликах ещё нет
+    new_id = writer.post("/transactions/", json=body).json()["id"]
+
+    targets = []
+    for _ in range(4):
+        target, ids = read(reader, user)
+        targets.append(target)
+        assert new_id not in ids
+    assert targets == ["replica-0", "replica-1"] * 2
+
+    # Только что писавший клиент читает с основной базы по cookie
+    target, ids = read(writer, user)
+    assert target == "primary" and new_id in ids
+
+    # Без cookie клиента узнаём по пользователю из токена
+    token = writer.post(
+        "/auth/login", json={"username_or_email": user["username"], "password": PASSWORD}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    time.sleep(STICKY_SECONDS + 0.1)
+    new_id = writer.post("/transactions/", headers=headers, json=body).json()["id"]
+    writer.cookies.clear()
+    target, ids = read(writer, user, headers=headers)
+    assert target == "primary" and new_id in ids
+
+    time.sleep(STICKY_SECONDS + 0.1)
+    target, ids = read(writer, user, headers=headers)
+    assert target.startswith("replica") and new_id not in ids
+
+    assert {"replica-0", "replica-1"} <= set(reader.get("/monitoring/db-pool").json())
@@ -0,0 +1,94 @@
+from datetime import datetime, time
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session, delete, select
+
+from app.core import config
+from app.db.connection import engine
+from app.db.reports import add_months, refresh_snapshots, stale_ranges
+from app.models.finance_models import MonthlySummarySnapshot, Transaction
+
+CURRENT_MONTH = datetime.utcnow().date().replace(day=1)
+PAST_MONTHS = [add_months(CURRENT_MONTH, -offset) for offset in (3, 2, 1)]
+
+
+@pytest.fixture
+def history(user, category, monkeypatch):
+    """По одному расходу за три закрытых месяца и снапшот этих месяцев."""
+    monkeypatch.setattr(config, "REPORT_SNAPSHOTS_ENABLED", True)
+    with Session(engine) as session:
+        transactions = [
+            Transaction(user_id=user["id"], category_id=category["id"], amount=-(index + 1) * 100_00,
+                        created_at=datetime.combine(month.replace(day=10), time.min))
+            for index, month in enumerate(PAST_MONTHS)
+        ]
+        session.add_all(transactions)
+        session.commit()
+        refresh_snapshots(session, PAST_MONTHS[0], CURRENT_MONTH)
+        return [t.id for t in transactions]
+
+
+def expenses(client, user) -> dict:
+    response = client.get("/reports/summary", params={"user_id": user["id"], "months": 4})
+    assert response.status_code == 200, response.text
+    return {month["period"]: Decimal(month["expenses"]) for month in response.json()["months"]}
+
+
+def test_gap_in_snapshot_is_computed_live(client, user, history):
+    with Session(engine) as session:
+        session.execute(delete(MonthlySummarySnapshot).where(MonthlySummarySnapshot.period == PAST_MONTHS[1]))
+        session.commit()
+
+    assert expenses(client, user) == {
+        PAST_MONTHS[0].isoformat(): Decimal("100.00"),
+        PAST_MONTHS[1].isoformat(): Decimal("200.00"),
+        PAST_MONTHS[2].isoformat(): Decimal("300.00"),
+    }
+
+
+def test_patch_and_delete_invalidate_closed_month(client, user, category, history):
+    response = client.patch(f"/transactions/{history[0]}", json={
+        "user_id": user["id"], "category_id": category["id"], "amount": "-150.00",
+    })
+    assert response.status_code == 200, response.text
+    assert client.delete(f"/transactions/{history[1]}").status_code == 200
+
+    with Session(engine) as session:
+        periods = session.exec(select(MonthlySummarySnapshot.period)).all()
+    assert periods == [PAST_MONTHS[2]]
+    assert expenses(client, user) == {
+        PAST_MONTHS[0].isoformat(): Decimal("150.00"),
+        PAST_MONTHS[2].isoformat(): Decimal("300.00"),
+    }
+
+
+def test_empty_month_gets_zero_row(client, user, category, history):
+    assert client.delete(f"/transactions/{history[1]}").status_code == 200
+    with Session(engine) as session:
+        refresh_snapshots(session, PAST_MONTHS[0], CURRENT_MONTH)
+        zero = session.get(MonthlySummarySnapshot, (user["id"], PAST_MONTHS[1], "RUB"))
+    assert (zero.income, zero.expenses, zero.top_categories) == (0, 0, [])
+    # Пустой месяц в ответ не попадает — так же, как при живом расчёте
+    assert expenses(client, user) == {
+        PAST_MONTHS[0].isoformat(): Decimal("100.00"),
+        PAST_MONTHS[2].isoformat(): Decimal("300.00"),
+    }
+
+
+def test_stale_ranges_cover_invalidated_months(client, user, category, history):
+    with Session(engine) as session:
+        assert stale_ranges(session, CURRENT_MONTH) == []
+
+    response = client.patch(f"/transactions/{history[1]}", json={
+        "user_id": user["id"], "category_id": category["id"], "amount": "-250.00",
+    })
+    assert response.status_code == 200, response.text
+    with Session(engine) as session:
+        ranges = stale_ranges(session, CURRENT_MONTH)
+        assert ranges == [(PAST_MONTHS[1], PAST_MONTHS[2])]
+        for since, until in ranges:
+            refresh_snapshots(session, since, until)
+        assert stale_ranges(session, CURRENT_MONTH) == []
+        periods = session.exec(select(MonthlySummarySnapshot.period)).all()
+    assert sorted(periods) == PAST_MONTHS
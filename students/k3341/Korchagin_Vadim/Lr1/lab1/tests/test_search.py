@@ -0,0 +1,71 @@
+"""Поиск по описаниям транзакций; в тестах это путь SQLite FTS5."""
+
+
+def spend(client, user_id, category, description) -> int:
+    response = client.post("/transactions/", json={
+        "user_id": user_id, "category_id": category["id"], "amount": "-1.00", "description": description,
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def search(client, user, q, **params) -> dict:
+    response = client.get("/search/transactions", params={"user_id": user["id"], "q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def found(client, user, q) -> list:
+    return [item["id"] for item in search(client, user, q)["items"]]
+
+
+def test_most_relevant_first(client, user, category):
+    diluted = spend(client, user["id"], category, "coffee and a sandwich at the station before the long train ride")
+    dense = spend(client, user["id"], category, "coffee coffee")
+    spend(client, user["id"], category, "tea")
+
+    items = search(client, user, "coffee")["items"]
+    assert [item["id"] for item in items] == [dense, diluted]
+    assert items[0]["rank"] > items[1]["rank"]
+
+
+def test_only_own_transactions(client, user, category):
+    own = spend(client, user["id"], category, "coffee")
+    other = client.post("/users/", json={"username": "other", "email": "other@example.com", "password": "pw"}).json()
+    spend(client, other["id"], category, "coffee")
+
+    assert found(client, user, "coffee") == [own]
+
+
+def test_cursor_pages_cover_all_hits(client, user, category):
+    ids = {spend(client, user["id"], category, f"coffee {index}") for index in range(5)}
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = search(client, user, "coffee", **params)
+        assert len(page["items"]) <= 2
+        seen += [item["id"] for item in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 3
+    assert sorted(seen) == sorted(ids)
+
+    response = client.get("/search/transactions", params={"user_id": user["id"], "q": "coffee", "cursor": "???"})
+    assert response.status_code == 400
+
+
+def test_index_follows_edit_and_delete(client, user, category):
+    trans_id = spend(client, user["id"], category, "coffee")
+
+    response = client.patch(f"/transactions/{trans_id}", json={
+        "user_id": user["id"], "category_id": category["id"], "amount": "-1.00", "description": "green tea",
+    })
+    assert response.status_code == 200, response.text
+    assert found(client, user, "coffee") == []
+    assert found(client, user, "tea") == [trans_id]
+
+    assert client.delete(f"/transactions/{trans_id}").status_code == 200
+    assert found(client, user, "tea") == []
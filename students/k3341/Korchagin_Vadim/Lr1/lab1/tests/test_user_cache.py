@@ -0,0 +1,79 @@
+import time
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from app.core import config, user_cache
+from app.core.user_cache import InMemoryUserCache, RedisUserCache, create_user_cache
+from conftest import PASSWORD
+
+ALICE = {"id": 1, "username": "alice", "email": "alice@example.com"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(user_cache, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_memory_cache_hit_ttl_and_invalidation(clock):
+    cache = InMemoryUserCache(ttl=60, max_size=10)
+    assert cache.get(1) is None
+    cache.set(1, ALICE)
+    assert cache.get(1) == ALICE
+
+    clock.value += 61
+    assert cache.get(1) is None
+
+    cache.set(1, ALICE)
+    cache.delete(1)
+    assert cache.get(1) is None
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = InMemoryUserCache(ttl=60, max_size=2)
+    cache.set(1, ALICE)
+    cache.set(2, ALICE)
+    cache.get(1)
+    cache.set(3, ALICE)
+    assert cache.get(2) is None
+    assert cache.get(1) == ALICE and cache.get(3) == ALICE
+
+
+def test_redis_cache_hit_ttl_and_invalidation():
+    client = fakeredis.FakeRedis()
+    cache = RedisUserCache(client, ttl=60)
+    assert cache.get(1) is None
+    cache.set(1, ALICE)
+    assert cache.get(1) == ALICE
+    assert 0 < client.ttl("user:1") <= 60
+
+    client.pexpire("user:1", 1)
+    time.sleep(0.01)
+    assert cache.get(1) is None
+
+    cache.set(1, ALICE)
+    cache.delete(1)
+    assert cache.get(1) is None
+
+
+def test_redis_backend_from_config(monkeypatch):
+    monkeypatch.setattr(config, "USER_CACHE_BACKEND", "redis")
+    assert isinstance(create_user_cache(), RedisUserCache)
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_current_user_is_cached_and_invalidated(client, user, monkeypatch, backend):
+    if backend == "redis":
+        monkeypatch.setattr(user_cache, "_user_cache", RedisUserCache(fakeredis.FakeRedis(), ttl=60))
+    token = client.post("/auth/login", json={"username_or_email": "user", "password": PASSWORD}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/auth/me", headers=headers).json()["username"] == "user"
+    assert user_cache.get_user_cache().get(user["id"])["username"] == "user"
+
+    client.patch(f"/users/{user['id']}", json={"username": "renamed", "email": "user@example.com", "password": "-"})
+    assert user_cache.get_user_cache().get(user["id"]) is None
+    assert client.get("/auth/me", headers=headers).json()["username"] == "renamed"
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.db.connection import engine
+from app.db.references import is_unique_violation
+from app.models.finance_models import User
+
+
+def test_create_user_can_log_in(client):
+    response = client.post("/users/", json={"username": "alice", "email": "alice@example.com", "password": "pw"})
+    assert response.status_code == 200, response.text
+
+    login = client.post("/auth/login", json={"username_or_email": "alice", "password": "pw"})
+    assert login.status_code == 200, login.text
+
+
+def test_duplicate_user_is_400(client, user):
+    response = client.post("/users/", json={"username": "user", "email": "other@example.com", "password": "pw"})
+    assert response.status_code == 400
+
+
+def test_only_unique_violations_are_recognized(user):
+    with Session(engine) as session:
+        session.add(User(username="user", email="dup@example.com", hashed_password="-"))
+        with pytest.raises(IntegrityError) as unique:
+            session.commit()
+        session.rollback()
+
+        session.add(User(username="bob", email="bob@example.com", hashed_password=None))
+        with pytest.raises(IntegrityError) as not_null:
+            session.commit()
+
+    assert is_unique_violation(unique.value)
+    assert not is_unique_violation(not_null.value)
+
+
+def test_get_user_include_and_limits(client, user, category):
+    for name in ("a", "b", "c"):
+        client.post("/accounts/", json={"user_id": user["id"], "name": name})
+    for amount in ("-1.00", "-2.00"):
+        client.post("/transactions/", json={"user_id": user["id"], "category_id": category["id"], "amount": amount})
+
+    body = client.get(f"/users/{user['id']}", params={"include": "accounts"}).json()
+    assert set(body) == {"id", "username", "email", "accounts"}
+    assert [account["name"] for account in body["accounts"]] == ["a", "b", "c"]
+
+    body = client.get(f"/users/{user['id']}", params={
+        "include": "accounts,transactions", "relations_limit": 2, "transactions_limit": 1,
+    }).json()
+    assert [account["name"] for account in body["accounts"]] == ["a", "b"]
+    assert len(body["transactions"]) == 1
+
+    assert client.get(f"/users/{user['id']}", params={"include": "friends"}).status_code == 400
+    assert client.get(f"/users/{user['id']}", params={"relations_limit": 5000}).status_code == 422
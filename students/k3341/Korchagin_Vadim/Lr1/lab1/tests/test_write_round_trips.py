@@ -0,0 +1,84 @@
+"""
+Сколько запросов к БД делают эндпоинты записи до вставки/обновления самой строки.
+Проверка ссылок (user, category, account) — один запрос, поэтому создание укладывается
+в два round trip'а (проверка + INSERT), а обновление — в три (ещё чтение самой
+изменяемой строки).
+"""
+import pytest
+from sqlalchemy import event
+
+from app.core import config
+from app.db.connection import async_engine, engine
+
+# Проверка ссылок + запись; PATCH сначала читает изменяемую строку
+MAX_ROUND_TRIPS = {"post": 2, "patch": 3}
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    # Общие бюджеты эндпоинтов (@query_budget) тоже проверяем
+    monkeypatch.setattr(config, "QUERY_BUDGET_MODE", "strict")
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(" ".join(statement.split()).upper().replace('"', ""))
+
+    # В PR1_DB_MODE=async транзакции пишутся через async_engine
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    yield recorded
+    for target in engines:
+        event.remove(target, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def refs(client, user, category, account) -> dict:
+    cafe = client.post("/categories/", json={"name": "cafe"}).json()
+    return {"user_id": user["id"], "category_id": category["id"], "cafe_id": cafe["id"], "account_id": account["id"]}
+
+
+def round_trips_until(statements: list, prefix: str) -> int:
+    for index, statement in enumerate(statements):
+        if statement.startswith(prefix):
+            return index + 1
+    raise AssertionError(f"no {prefix!r} among {statements}")
+
+
+def check_write(client, statements, method, path, body, write_prefix) -> None:
+    statements.clear()
+    response = getattr(client, method)(path, json=body)
+    assert response.status_code == 200, response.text
+    assert round_trips_until(statements, write_prefix) <= MAX_ROUND_TRIPS[method], statements
+
+
+def test_transaction_writes(client, refs, statements):
+    body = {"user_id": refs["user_id"], "category_id": refs["category_id"], "account_id": refs["account_id"],
+            "amount": "-10", "description": "coffee"}
+    check_write(client, statements, "post", "/transactions/", body, "INSERT INTO TRANSACTION")
+    created_id = client.get("/transactions/").json()["items"][0]["id"]
+    check_write(client, statements, "patch", f"/transactions/{created_id}",
+                {**body, "category_id": refs["cafe_id"], "amount": "-12"}, "UPDATE ACCOUNT")
+
+
+def test_budget_writes(client, refs, statements):
+    body = {"user_id": refs["user_id"], "category_id": refs["category_id"], "limit_amount": "1000"}
+    check_write(client, statements, "post", "/budgets/", body, "INSERT INTO BUDGET")
+    budget_id = client.get("/budgets/").json()[0]["id"]
+    check_write(client, statements, "patch", f"/budgets/{budget_id}",
+                {**body, "category_id": refs["cafe_id"], "limit_amount": "2000"}, "UPDATE BUDGET")
+
+
+def test_preference_write(client, refs, statements):
+    check_write(client, statements, "post", "/preferences/",
+                {"user_id": refs["user_id"], "category_id": refs["category_id"], "notification_enabled": True},
+                "INSERT INTO USERCATEGORYPREFERENCE")
+
+
+def test_missing_reference_costs_one_query(client, refs, statements):
+    # Ссылка на несуществующую категорию отсекается тем же единственным запросом
+    statements.clear()
+    response = client.post("/transactions/", json={"user_id": refs["user_id"], "category_id": 999, "amount": "-1"})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Category not found"
+    assert len(statements) == 1, statements